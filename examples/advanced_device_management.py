@@ -11,7 +11,8 @@ This script shows how to:
 
 import asyncio
 import logging
-from typing import List
+from collections import Counter
+from typing import Dict, List
 
 from solox.device_management.device_pool import DevicePool
 from solox.device_management.advanced_features import (
@@ -29,6 +30,24 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Adaptive sweep interval bounds (seconds)
+MIN_INTERVAL = 2.0
+MAX_INTERVAL = 60.0
+# Distribution shift that counts as "fleet health changed"
+DIVERGENCE_THRESHOLD = 0.1
+# Stable rounds required before the interval is relaxed, avoids flapping
+STABLE_ROUNDS = 3
+BACKOFF_FACTOR = 1.5
+
+def status_divergence(prev: Counter, cur: Counter) -> float:
+    """L1 distance between two normalized health-status distributions (0 to 2)."""
+    prev_total = sum(prev.values()) or 1
+    cur_total = sum(cur.values()) or 1
+    return sum(
+        abs(prev[status] / prev_total - cur[status] / cur_total)
+        for status in prev.keys() | cur.keys()
+    )
+
 async def monitor_devices(device_ids: List[str], duration: int = 300):
     """Monitor multiple devices for a specified duration."""
     # Initialize device pool
@@ -57,57 +76,87 @@ async def monitor_devices(device_ids: List[str], duration: int = 300):
         }
     )
     
+    async def process_device(device_id: str, device):
+        """Check health, recover if needed and collect metrics for one device."""
+        health = await health_monitor.check_device_health(device_id)
+        logger.info("Device %s health: %s", device_id, health)
+        
+        if health.status != "healthy":
+            logger.warning("Unhealthy device detected: %s", device_id)
+            recovery_success = await auto_recovery.check_and_recover(device_id)
+            if recovery_success:
+                logger.info("Successfully recovered device %s", device_id)
+            else:
+                logger.error("Failed to recover device %s", device_id)
+        
+        metrics = await performance_profiler._collect_metrics_for(device_id, device)
+        return health, metrics
+    
     try:
         # Apply profiles to devices
         for device_id in device_ids:
             try:
                 profile_manager.apply_profile(device_id, "high_performance", device_pool)
-                logger.info(f"Applied high performance profile to device {device_id}")
+                logger.info("Applied high performance profile to device %s", device_id)
             except Exception as e:
-                logger.error(f"Failed to apply profile to device {device_id}: {e}")
+                logger.error("Failed to apply profile to device %s: %s", device_id, e)
         
         # Start monitoring loop
-        start_time = asyncio.get_event_loop().time()
-        while asyncio.get_event_loop().time() - start_time < duration:
+        now = asyncio.get_running_loop().time
+        deadline = now() + duration
+        dirty = set(device_ids)
+        interval = 10.0
+        stable_rounds = 0
+        last_status: Dict[str, str] = {}
+        prev_dist = None
+        while now() < deadline:
             # Execute batch operation
             result = await batch_manager.execute_batch(
                 "check_status",
                 {"detailed": True},
                 device_ids
             )
-            logger.info(f"Batch status check results: {result}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Batch status check results: %r", result)
             
-            # Check health and attempt recovery if needed
-            for device_id in device_ids:
-                health = await health_monitor.check_device_health(device_id)
-                logger.info(f"Device {device_id} health: {health}")
-                
-                if health.status != "healthy":
-                    logger.warning(f"Unhealthy device detected: {device_id}")
-                    recovery_success = await auto_recovery.check_and_recover(device_id)
-                    if recovery_success:
-                        logger.info(f"Successfully recovered device {device_id}")
-                    else:
-                        logger.error(f"Failed to recover device {device_id}")
+            # Health check, recovery and metrics run as one pipeline per device
+            pending = [device_id for device_id in device_ids if device_id in dirty]
+            # The device objects health and metrics work with, not the pool's DeviceInfo records
+            devices = {d: device_pool.get_device(d) for d in pending}
+            results = await asyncio.gather(
+                *(process_device(d, devices[d]) for d in pending),
+                return_exceptions=True
+            )
+            for device_id, outcome in zip(pending, results):
+                if isinstance(outcome, Exception):
+                    logger.error("Failed to monitor device %s: %s", device_id, outcome)
+                    last_status[device_id] = "error"
+                else:
+                    health, metrics = outcome
+                    last_status[device_id] = health.status
+                    logger.info("Device %s metrics: %s", device_id, metrics)
             
-            # Collect performance metrics
-            for device_id in device_ids:
-                try:
-                    metrics = await performance_profiler._collect_metrics(device_id)
-                    logger.info(f"Device {device_id} metrics: {metrics}")
-                except Exception as e:
-                    logger.error(f"Failed to collect metrics for device {device_id}: {e}")
+            # Tighten the sweep interval while fleet health is shifting, relax it once stable
+            cur_dist = Counter(last_status.values())
+            if prev_dist is not None:
+                if status_divergence(prev_dist, cur_dist) > DIVERGENCE_THRESHOLD:
+                    interval = max(MIN_INTERVAL, interval / 2)
+                    stable_rounds = 0
+                else:
+                    stable_rounds += 1
+                    if stable_rounds >= STABLE_ROUNDS:
+                        interval = min(MAX_INTERVAL, interval * BACKOFF_FACTOR)
+                        stable_rounds = 0
+            prev_dist = cur_dist
             
-            # Wait before next iteration
-            await asyncio.sleep(10)
+            # Wait for a device state change, falling back to a full sweep after the interval
+            changed = await asyncio.to_thread(device_pool.wait_for_changes, interval)
+            dirty = changed.intersection(device_ids) if changed else set(device_ids)
     
     except KeyboardInterrupt:
         logger.info("Monitoring stopped by user")
     except Exception as e:
-        logger.error(f"Error during monitoring: {e}")
-    finally:
-        # Clean up
-        batch_manager.executor.shutdown()
+        logger.error("Error during monitoring: %s", e)
 
 async def main():
     """Main function demonstrating advanced device management."""
@@ -115,13 +164,13 @@ async def main():
     device_ids = ["device1", "device2", "device3"]
     
     logger.info("Starting advanced device management demo")
-    logger.info(f"Monitoring devices: {device_ids}")
+    logger.info("Monitoring devices: %s", device_ids)
     
     try:
         # Monitor devices for 5 minutes
         await monitor_devices(device_ids, duration=300)
     except Exception as e:
-        logger.error(f"Error in main: {e}")
+        logger.error("Error in main: %s", e)
 
 if __name__ == "__main__":
     # Run the async main function
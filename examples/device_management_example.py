@@ -43,11 +43,12 @@ def main():
         
         # Monitor devices for a while
         print("\nMonitoring devices for 30 seconds...")
-        start_time = time.time()
-        while time.time() - start_time < 30:
+        deadline = time.monotonic() + 30
+        while (remaining := deadline - time.monotonic()) > 0:
             connected_devices = manager.device_pool.get_connected_devices()
             print(f"\rConnected devices: {len(connected_devices)}", end="")
-            time.sleep(1)
+            # Only wake up again when a device actually connects or disconnects
+            manager.device_pool.wait_for_changes(timeout=remaining)
             
     except KeyboardInterrupt:
         print("\n\nStopping device monitoring...")
@@ -8,11 +8,12 @@ This package provides enhanced device management features including:
 - Robust error handling
 """
 
-from .device_pool import DevicePool, DeviceType, DeviceInfo
+from .device_pool import AsyncDevicePool, DevicePool, DeviceType, DeviceInfo
 from .device_manager import DeviceManager, VersionSupport
 
 __all__ = [
     'DevicePool',
+    'AsyncDevicePool',
     'DeviceType',
     'DeviceInfo',
     'DeviceManager',
@@ -9,18 +9,25 @@ This module provides enhanced capabilities for managing multiple devices:
 - Custom device profiles
 """
 
+import asyncio
 import logging
+import os
+import re
 import time
+from collections import defaultdict, deque
 from dataclasses import dataclass
-from typing import Dict, List, Optional, Tuple, Union
-from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from operator import attrgetter
+from typing import Deque, Dict, List, Optional, Pattern, Tuple, Union
+
+import numpy as np
 
 from .device_pool import DevicePool
 from .exceptions import DeviceError, OperationError
 
 logger = logging.getLogger(__name__)
 
-@dataclass
+@dataclass(slots=True)
 class DeviceHealth:
     """Device health metrics and status."""
     device_id: str
@@ -32,7 +39,7 @@ class DeviceHealth:
     last_error: Optional[str] = None
     status: str = "healthy"
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class PerformanceMetrics:
     """Performance metrics for a device."""
     device_id: str
@@ -41,6 +48,62 @@ class PerformanceMetrics:
     error_rate: float
     timestamp: float
 
+METRICS_DTYPE = np.dtype([
+    ("response_time", "f8"),
+    ("throughput", "f8"),
+    ("error_rate", "f8"),
+    ("timestamp", "f8")
+])
+
+class MetricsHistory:
+    """Fixed-size ring buffer of performance metrics for one device, stored as a structured array."""
+    
+    def __init__(self, capacity: int = 1000):
+        self.device_id: Optional[str] = None
+        self._rows = np.zeros(capacity, dtype=METRICS_DTYPE)
+        self._head = 0
+        self._size = 0
+    
+    def append(self, metrics: PerformanceMetrics):
+        """Write one row, overwriting the oldest once the buffer is full."""
+        self.device_id = metrics.device_id
+        self._rows[self._head] = (metrics.response_time, metrics.throughput, metrics.error_rate, metrics.timestamp)
+        self._head = (self._head + 1) % len(self._rows)
+        self._size = min(self._size + 1, len(self._rows))
+    
+    def __len__(self) -> int:
+        return self._size
+    
+    def __iter__(self):
+        for row in self.to_array():
+            yield self._to_metrics(row)
+    
+    def __getitem__(self, index: int) -> PerformanceMetrics:
+        if not -self._size <= index < self._size:
+            raise IndexError("metrics history index out of range")
+        start = self._head - self._size
+        return self._to_metrics(self._rows[(start + index % self._size) % len(self._rows)])
+    
+    def _to_metrics(self, row) -> PerformanceMetrics:
+        return PerformanceMetrics(
+            device_id=self.device_id,
+            response_time=float(row["response_time"]),
+            throughput=float(row["throughput"]),
+            error_rate=float(row["error_rate"]),
+            timestamp=float(row["timestamp"])
+        )
+    
+    def to_array(self) -> np.ndarray:
+        """Return the stored rows, oldest first."""
+        if self._size < len(self._rows):
+            return self._rows[:self._size].copy()
+        return np.concatenate((self._rows[self._head:], self._rows[:self._head]))
+    
+    def to_dataframe(self):
+        """Return the stored rows as a pandas DataFrame, oldest first."""
+        import pandas as pd
+        return pd.DataFrame(self.to_array())
+
 @dataclass
 class DeviceProfile:
     """Custom device configuration profile."""
@@ -49,47 +112,52 @@ class DeviceProfile:
     compatibility: List[str]
     performance_targets: Dict[str, float]
 
+@lru_cache(maxsize=128)
+def _compile_compatibility(patterns: Tuple[str, ...]) -> Pattern:
+    """Compile profile compatibility patterns into a single alternation."""
+    return re.compile("|".join(f"(?:{p})" for p in patterns))
+
 class BatchOperationManager:
     """Manages batch operations across multiple devices."""
     
-    def __init__(self, device_pool: DevicePool):
+    def __init__(self, device_pool: DevicePool, max_concurrency: int = 64):
         self.device_pool = device_pool
-        self.executor = ThreadPoolExecutor(max_workers=10)
+        self.max_concurrency = max_concurrency
     
     async def execute_batch(self, operation: str, params: Dict, devices: Optional[List[str]] = None) -> Dict[str, any]:
         """Execute an operation across multiple devices in parallel."""
         if devices is None:
             devices = self.device_pool.list_devices()
         
-        results = {}
-        futures = []
-        
-        for device_id in devices:
-            future = self.executor.submit(
-                self._execute_single_operation,
-                device_id,
-                operation,
-                params
-            )
-            futures.append((device_id, future))
+        # Created per batch so the semaphore is bound to the running event loop
+        semaphore = asyncio.Semaphore(max(1, min(len(devices), self.max_concurrency)))
+        tasks = [
+            asyncio.create_task(self._execute_single_operation(device_id, operation, params, semaphore))
+            for device_id in devices
+        ]
+        outcomes = await asyncio.gather(*tasks, return_exceptions=True)
         
-        for device_id, future in futures:
-            try:
-                results[device_id] = future.result()
-            except Exception as e:
-                logger.error(f"Operation failed for device {device_id}: {str(e)}")
-                results[device_id] = {"status": "error", "error": str(e)}
+        results = {}
+        for device_id, outcome in zip(devices, outcomes):
+            if isinstance(outcome, Exception):
+                logger.error("Operation failed for device %s: %s", device_id, outcome)
+                results[device_id] = {"status": "error", "error": str(outcome)}
+            else:
+                results[device_id] = outcome
         
         return results
     
-    def _execute_single_operation(self, device_id: str, operation: str, params: Dict) -> Dict:
-        """Execute operation on a single device."""
-        device = self.device_pool.get_device(device_id)
+    async def _execute_single_operation(self, device_id: str, operation: str, params: Dict,
+                                        semaphore: asyncio.Semaphore, device=None) -> Dict:
+        """Execute operation on a single device, optionally on an already resolved device."""
+        if device is None:
+            device = self.device_pool.get_device(device_id)
         if not device:
             raise DeviceError(f"Device {device_id} not found")
         
         try:
-            result = getattr(device, operation)(**params)
+            async with semaphore:
+                result = await getattr(device, operation)(**params)
             return {"status": "success", "result": result}
         except Exception as e:
             raise OperationError(f"Operation {operation} failed: {str(e)}")
@@ -99,7 +167,8 @@ class HealthMonitor:
     
     def __init__(self, device_pool: DevicePool):
         self.device_pool = device_pool
-        self.health_history: Dict[str, List[DeviceHealth]] = {}
+        # Keep last 100 records per device
+        self.health_history: Dict[str, Deque[DeviceHealth]] = defaultdict(lambda: deque(maxlen=100))
         self.alert_thresholds = {
             "cpu_usage": 90.0,
             "memory_usage": 90.0,
@@ -107,55 +176,85 @@ class HealthMonitor:
             "temperature": 45.0,
             "connection_strength": 30.0
         }
+        self._threshold_key = None
+        self._threshold_table = None
+    
+    def _thresholds(self) -> Tuple[attrgetter, np.ndarray]:
+        """Return a metric getter and threshold vector, rebuilt only when alert_thresholds changes."""
+        key = tuple(self.alert_thresholds.items())
+        if key != self._threshold_key:
+            names = [name for name, _ in key]
+            self._threshold_table = (
+                attrgetter(*names),
+                np.array([threshold for _, threshold in key], dtype=np.float64)
+            )
+            self._threshold_key = key
+        return self._threshold_table
     
     async def check_device_health(self, device_id: str) -> DeviceHealth:
         """Check health metrics for a specific device."""
-        device = self.device_pool.get_device(device_id)
-        if not device:
-            raise DeviceError(f"Device {device_id} not found")
+        return (await self.check_batch([device_id]))[0]
+    
+    async def check_batch(self, device_ids: List[str]) -> List[DeviceHealth]:
+        """Check health metrics for several devices, evaluating thresholds in one vectorized pass."""
+        devices = []
+        for device_id in device_ids:
+            device = self.device_pool.get_device(device_id)
+            if not device:
+                raise DeviceError(f"Device {device_id} not found")
+            devices.append(device)
         
-        try:
-            metrics = await device.get_metrics()
-            health = DeviceHealth(
-                device_id=device_id,
-                cpu_usage=metrics["cpu_usage"],
-                memory_usage=metrics["memory_usage"],
-                battery_level=metrics.get("battery_level"),
-                temperature=metrics.get("temperature"),
-                connection_strength=metrics["connection_strength"]
-            )
-            
-            # Update status based on thresholds
-            if any(
-                getattr(health, metric) > threshold
-                for metric, threshold in self.alert_thresholds.items()
-                if getattr(health, metric) is not None
-            ):
-                health.status = "warning"
-            
-            self._update_health_history(device_id, health)
-            return health
-            
-        except Exception as e:
-            logger.error(f"Health check failed for device {device_id}: {str(e)}")
-            return DeviceHealth(
-                device_id=device_id,
-                cpu_usage=0.0,
-                memory_usage=0.0,
-                battery_level=None,
-                temperature=None,
-                connection_strength=0.0,
-                last_error=str(e),
-                status="error"
-            )
+        async def fetch(device):
+            return await device.get_metrics()
+        
+        raw_metrics = await asyncio.gather(*map(fetch, devices), return_exceptions=True)
+        
+        results = []
+        for device_id, metrics in zip(device_ids, raw_metrics):
+            try:
+                if isinstance(metrics, Exception):
+                    raise metrics
+                health = DeviceHealth(
+                    device_id=device_id,
+                    cpu_usage=metrics["cpu_usage"],
+                    memory_usage=metrics["memory_usage"],
+                    battery_level=metrics.get("battery_level"),
+                    temperature=metrics.get("temperature"),
+                    connection_strength=metrics["connection_strength"]
+                )
+            except Exception as e:
+                logger.error("Health check failed for device %s: %s", device_id, e)
+                health = DeviceHealth(
+                    device_id=device_id,
+                    cpu_usage=0.0,
+                    memory_usage=0.0,
+                    battery_level=None,
+                    temperature=None,
+                    connection_strength=0.0,
+                    last_error=str(e),
+                    status="error"
+                )
+            results.append(health)
+        
+        checked = [health for health in results if health.status != "error"]
+        if checked:
+            # Update status based on thresholds, missing metrics become NaN and never alert
+            get_metrics, thresholds = self._thresholds()
+            values = np.array(
+                [get_metrics(health) for health in checked],
+                dtype=np.float64
+            ).reshape(len(checked), len(thresholds))
+            warnings = (values > thresholds).any(axis=1)
+            for health, warning in zip(checked, warnings):
+                if warning:
+                    health.status = "warning"
+                self._update_health_history(health.device_id, health)
+        
+        return results
     
     def _update_health_history(self, device_id: str, health: DeviceHealth):
         """Update health history for a device."""
-        if device_id not in self.health_history:
-            self.health_history[device_id] = []
         self.health_history[device_id].append(health)
-        # Keep last 100 records
-        self.health_history[device_id] = self.health_history[device_id][-100:]
 
 class AutoRecovery:
     """Handles automatic device recovery."""
@@ -163,7 +262,7 @@ class AutoRecovery:
     def __init__(self, device_pool: DevicePool, health_monitor: HealthMonitor):
         self.device_pool = device_pool
         self.health_monitor = health_monitor
-        self.recovery_attempts: Dict[str, int] = {}
+        self.recovery_attempts: Dict[str, int] = defaultdict(int)
         self.max_attempts = 3
     
     async def check_and_recover(self, device_id: str) -> bool:
@@ -174,16 +273,16 @@ class AutoRecovery:
             self.recovery_attempts[device_id] = 0
             return True
         
-        if self.recovery_attempts.get(device_id, 0) >= self.max_attempts:
-            logger.error(f"Max recovery attempts reached for device {device_id}")
+        if self.recovery_attempts[device_id] >= self.max_attempts:
+            logger.error("Max recovery attempts reached for device %s", device_id)
             return False
         
         try:
             await self._attempt_recovery(device_id, health)
-            self.recovery_attempts[device_id] = self.recovery_attempts.get(device_id, 0) + 1
+            self.recovery_attempts[device_id] += 1
             return True
         except Exception as e:
-            logger.error(f"Recovery failed for device {device_id}: {str(e)}")
+            logger.error("Recovery failed for device %s: %s", device_id, e)
             return False
     
     async def _attempt_recovery(self, device_id: str, health: DeviceHealth):
@@ -204,9 +303,29 @@ class AutoRecovery:
 class PerformanceProfiler:
     """Profiles device performance."""
     
-    def __init__(self, device_pool: DevicePool):
+    def __init__(self, device_pool: DevicePool, history_dir: Optional[str] = None, spill_rows: int = 64):
         self.device_pool = device_pool
-        self.metrics_history: Dict[str, List[PerformanceMetrics]] = {}
+        # Keep last 1000 records per device
+        self.metrics_history: Dict[str, MetricsHistory] = defaultdict(MetricsHistory)
+        # Optional on-disk history, one Arrow IPC stream per device
+        self.history_dir = history_dir
+        self.spill_rows = spill_rows
+        self._pending: Dict[str, List[PerformanceMetrics]] = defaultdict(list)
+        self._writers = {}
+        if history_dir is not None:
+            # Fail here rather than mid-profiling with samples already buffered
+            try:
+                import pyarrow as pa
+            except ImportError:
+                raise RuntimeError("Metrics history on disk requires pyarrow, fix with: pip3 install pyarrow")
+            os.makedirs(history_dir, exist_ok=True)
+            self._pa = pa
+            self._schema = pa.schema([
+                ("response_time", pa.float64()),
+                ("throughput", pa.float64()),
+                ("error_rate", pa.float64()),
+                ("timestamp", pa.float64())
+            ])
     
     async def start_profiling(self, device_id: str, duration: int = 60) -> List[PerformanceMetrics]:
         """Profile device performance for a specified duration."""
@@ -215,19 +334,37 @@ class PerformanceProfiler:
             raise DeviceError(f"Device {device_id} not found")
         
         metrics_list = []
-        start_time = time.time()
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + duration
+        next_tick = loop.time()
         
-        while time.time() - start_time < duration:
-            metrics = await self._collect_metrics(device_id)
+        # Sample on absolute ticks so collection time doesn't accumulate as drift
+        while loop.time() < deadline:
+            metrics = await self._collect_metrics_for(device_id, device)
             metrics_list.append(metrics)
             self._update_metrics_history(device_id, metrics)
-            await asyncio.sleep(1)
+            next_tick += 1.0
+            await asyncio.sleep(max(0, next_tick - loop.time()))
         
         return metrics_list
     
-    async def _collect_metrics(self, device_id: str) -> PerformanceMetrics:
+    async def collect_metrics(self, device_id: str) -> PerformanceMetrics:
         """Collect performance metrics for a device."""
         device = self.device_pool.get_device(device_id)
+        if not device:
+            raise DeviceError(f"Device {device_id} not found")
+        return await self._collect_metrics_for(device_id, device)
+    
+    async def _collect_metrics(self, device_id: str) -> PerformanceMetrics:
+        """Collect performance metrics for a device (kept for existing callers, never raises)."""
+        try:
+            return await self.collect_metrics(device_id)
+        except DeviceError as e:
+            logger.error("Failed to collect metrics for device %s: %s", device_id, e)
+            return self._error_metrics(device_id)
+    
+    async def _collect_metrics_for(self, device_id: str, device) -> PerformanceMetrics:
+        """Collect performance metrics for an already resolved device."""
         start_time = time.time()
         
         try:
@@ -243,22 +380,56 @@ class PerformanceProfiler:
                 timestamp=time.time()
             )
         except Exception as e:
-            logger.error(f"Failed to collect metrics for device {device_id}: {str(e)}")
-            return PerformanceMetrics(
-                device_id=device_id,
-                response_time=0.0,
-                throughput=0.0,
-                error_rate=1.0,
-                timestamp=time.time()
-            )
+            logger.error("Failed to collect metrics for device %s: %s", device_id, e)
+            return self._error_metrics(device_id)
+    
+    @staticmethod
+    def _error_metrics(device_id: str) -> PerformanceMetrics:
+        """Metrics recorded for a sample that couldn't be collected."""
+        return PerformanceMetrics(
+            device_id=device_id,
+            response_time=0.0,
+            throughput=0.0,
+            error_rate=1.0,
+            timestamp=time.time()
+        )
     
     def _update_metrics_history(self, device_id: str, metrics: PerformanceMetrics):
         """Update metrics history for a device."""
-        if device_id not in self.metrics_history:
-            self.metrics_history[device_id] = []
         self.metrics_history[device_id].append(metrics)
-        # Keep last 1000 records
-        self.metrics_history[device_id] = self.metrics_history[device_id][-1000:]
+        if self.history_dir is not None:
+            pending = self._pending[device_id]
+            pending.append(metrics)
+            if len(pending) >= self.spill_rows:
+                self._spill(device_id)
+    
+    def _spill(self, device_id: str):
+        """Append buffered metrics for a device to its Arrow IPC stream as one record batch."""
+        rows = self._pending.get(device_id)
+        if not rows:
+            return
+        pa, schema = self._pa, self._schema
+        writer = self._writers.get(device_id)
+        if writer is None:
+            filename = re.sub(r"[^\w.-]", "_", device_id) + ".arrows"
+            writer = pa.ipc.new_stream(os.path.join(self.history_dir, filename), schema)
+            self._writers[device_id] = writer
+        writer.write_batch(pa.record_batch([
+            pa.array([m.response_time for m in rows], pa.float64()),
+            pa.array([m.throughput for m in rows], pa.float64()),
+            pa.array([m.error_rate for m in rows], pa.float64()),
+            pa.array([m.timestamp for m in rows], pa.float64())
+        ], schema=schema))
+        # Only dropped once written, a failed write keeps them for the next spill
+        del self._pending[device_id]
+    
+    def close(self):
+        """Flush buffered metrics and close on-disk history streams."""
+        for device_id in list(self._pending):
+            self._spill(device_id)
+        for writer in self._writers.values():
+            writer.close()
+        self._writers.clear()
 
 class ProfileManager:
     """Manages custom device profiles."""
@@ -275,6 +446,8 @@ class ProfileManager:
             compatibility=compatibility,
             performance_targets=performance_targets
         )
+        # Compile up front so invalid patterns fail at creation time
+        _compile_compatibility(tuple(compatibility))
         self.profiles[name] = profile
         return profile
     
@@ -290,7 +463,7 @@ class ProfileManager:
         profile = self.profiles[profile_name]
         
         # Check compatibility
-        if device.model not in profile.compatibility:
+        if not _compile_compatibility(tuple(profile.compatibility)).fullmatch(device.model):
             raise ValueError(f"Profile {profile_name} is not compatible with device {device_id}")
         
         try:
@@ -298,5 +471,5 @@ class ProfileManager:
                 setattr(device, setting, value)
             return True
         except Exception as e:
-            logger.error(f"Failed to apply profile {profile_name} to device {device_id}: {str(e)}")
+            logger.error("Failed to apply profile %s to device %s: %s", profile_name, device_id, e)
             return False 
\ No newline at end of file
@@ -2,7 +2,10 @@
 Device manager module for handling device version compatibility and feature support
 """
 
+import asyncio
 import re
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from typing import Dict, List, Optional, Tuple
 from packaging import version
 import tidevice
@@ -37,6 +40,37 @@ class VersionSupport:
             "screen_recording": "11.0",
         }
     }
+    
+    # Parsed once at import so compatibility checks don't re-parse constants
+    _MIN_ANDROID = version.parse(MIN_ANDROID_VERSION)
+    _MIN_IOS = version.parse(MIN_IOS_VERSION)
+    _MAX_ANDROID = version.parse(LATEST_ANDROID_VERSION)
+    _MAX_IOS = version.parse(LATEST_IOS_VERSION)
+
+# Device versions repeat across checks, so memoize parsing by version string
+_parse_version = lru_cache(maxsize=256)(version.parse)
+
+@lru_cache(maxsize=256)
+def _is_supported(device_type: DeviceType, device_version: str) -> bool:
+    """Check version support for a device type and version string"""
+    parsed = _parse_version(device_version)
+    if device_type == DeviceType.ANDROID:
+        return VersionSupport._MIN_ANDROID <= parsed <= VersionSupport._MAX_ANDROID
+    return VersionSupport._MIN_IOS <= parsed <= VersionSupport._MAX_IOS
+
+@lru_cache(maxsize=256)
+def _supported_features(device_type: DeviceType, device_version: str) -> Tuple[Tuple[str, bool], ...]:
+    """Get feature support for a device type and version string.
+    
+    Call _supported_features.cache_clear() after changing VersionSupport.FEATURE_SUPPORT at runtime.
+    """
+    parsed = _parse_version(device_version)
+    platform = "android" if device_type == DeviceType.ANDROID else "ios"
+    # Read FEATURE_SUPPORT here rather than a parsed copy so cache_clear() picks up edits
+    return tuple(
+        (feature, parsed >= _parse_version(min_version))
+        for feature, min_version in VersionSupport.FEATURE_SUPPORT[platform].items()
+    )
 
 class DeviceManager:
     """Manages device compatibility and feature support"""
@@ -53,81 +87,94 @@ class DeviceManager:
         """Stop device monitoring"""
         self.device_pool.stop_monitoring()
 
-    def scan_devices(self) -> List[DeviceInfo]:
-        """Scan and register all connected devices"""
-        # Scan Android devices
-        for device in adb.device_list():
-            try:
-                # Get Android device information
-                props = device.get_properties()
-                device_id = device.serial
-                name = props.get('ro.product.model', 'Unknown Android Device')
-                android_version = props.get('ro.build.version.release', '0.0')
-                
-                self.device_pool.add_device(
-                    device_id=device_id,
-                    device_type=DeviceType.ANDROID,
-                    name=name,
-                    version=android_version
-                )
-            except Exception as e:
-                self.logger.error(f"Error scanning Android device {device.serial}: {e}")
-
-        # Scan iOS devices
+    def _probe_android(self, device) -> Optional[Dict]:
+        """Read Android device information (blocking adb round-trip)"""
+        try:
+            props = device.get_properties()
+            return dict(
+                device_id=device.serial,
+                device_type=DeviceType.ANDROID,
+                name=props.get('ro.product.model', 'Unknown Android Device'),
+                version=props.get('ro.build.version.release', '0.0')
+            )
+        except Exception as e:
+            self.logger.error(f"Error scanning Android device {device.serial}: {e}")
+            return None
+
+    def _probe_ios(self, udid: str) -> Optional[Dict]:
+        """Read iOS device information (blocking usbmux round-trip)"""
+        try:
+            device_info = tidevice.Device(udid).device_info()
+            return dict(
+                device_id=udid,
+                device_type=DeviceType.IOS,
+                name=device_info.get('DeviceName', 'Unknown iOS Device'),
+                version=device_info.get('ProductVersion', '0.0')
+            )
+        except Exception as e:
+            self.logger.error(f"Error scanning iOS device {udid}: {e}")
+            return None
+
+    def _list_ios(self) -> List[str]:
+        """udids of the iOS devices usbmux can see, [] if usbmux can't be reached"""
         try:
-            for device in tidevice.Usbmux().devices():
-                try:
-                    # Get iOS device information
-                    d = tidevice.Device(device.udid)
-                    device_info = d.device_info()
-                    
-                    self.device_pool.add_device(
-                        device_id=device.udid,
-                        device_type=DeviceType.IOS,
-                        name=device_info.get('DeviceName', 'Unknown iOS Device'),
-                        version=device_info.get('ProductVersion', '0.0')
-                    )
-                except Exception as e:
-                    self.logger.error(f"Error scanning iOS device {device.udid}: {e}")
+            return [d.udid for d in tidevice.Usbmux().devices()]
         except Exception as e:
             self.logger.error(f"Error accessing iOS devices: {e}")
+            return []
 
+    def _register(self, probes) -> List[DeviceInfo]:
+        """Add every successfully probed device to the pool"""
+        for probe in probes:
+            if probe is not None:
+                self.device_pool.add_device(**probe)
         return self.device_pool.get_all_devices()
 
+    async def _scan_android(self) -> List[Optional[Dict]]:
+        """Probe all Android devices concurrently"""
+        devices = await asyncio.to_thread(adb.device_list)
+        return await asyncio.gather(*(asyncio.to_thread(self._probe_android, d) for d in devices))
+
+    async def _scan_ios(self) -> List[Optional[Dict]]:
+        """Probe all iOS devices concurrently"""
+        udids = await asyncio.to_thread(self._list_ios)
+        return await asyncio.gather(*(asyncio.to_thread(self._probe_ios, udid) for udid in udids))
+
+    async def scan_devices_async(self) -> List[DeviceInfo]:
+        """Scan and register all connected devices, probing Android and iOS in parallel"""
+        android, ios = await asyncio.gather(self._scan_android(), self._scan_ios())
+        return self._register((*android, *ios))
+
+    def scan_devices(self) -> List[DeviceInfo]:
+        """Scan and register all connected devices
+
+        Probes run on worker threads rather than an event loop, so this also works when
+        called from inside one (async callers, Jupyter), use scan_devices_async there if awaiting.
+        """
+        with ThreadPoolExecutor() as executor:
+            android = executor.submit(adb.device_list)
+            ios = executor.submit(self._list_ios)
+            probes = [executor.submit(self._probe_android, d) for d in android.result()]
+            probes += [executor.submit(self._probe_ios, udid) for udid in ios.result()]
+            return self._register(probe.result() for probe in probes)
+
     def is_version_supported(self, device_info: DeviceInfo) -> bool:
         """Check if device version is supported"""
         try:
-            device_version = version.parse(device_info.version)
-            
-            if device_info.type == DeviceType.ANDROID:
-                min_version = version.parse(VersionSupport.MIN_ANDROID_VERSION)
-                max_version = version.parse(VersionSupport.LATEST_ANDROID_VERSION)
-            else:
-                min_version = version.parse(VersionSupport.MIN_IOS_VERSION)
-                max_version = version.parse(VersionSupport.LATEST_IOS_VERSION)
-            
-            return min_version <= device_version <= max_version
+            return _is_supported(device_info.type, device_info.version)
         except Exception as e:
             self.logger.error(f"Error checking version support for device {device_info.id}: {e}")
             return False
 
     def get_supported_features(self, device_info: DeviceInfo) -> Dict[str, bool]:
         """Get list of supported features for a device"""
-        features = {}
         try:
-            device_version = version.parse(device_info.version)
-            platform = "android" if device_info.type == DeviceType.ANDROID else "ios"
-            
-            for feature, min_version in VersionSupport.FEATURE_SUPPORT[platform].items():
-                features[feature] = device_version >= version.parse(min_version)
-                
+            return dict(_supported_features(device_info.type, device_info.version))
         except Exception as e:
             self.logger.error(f"Error checking feature support for device {device_info.id}: {e}")
             # Set all features to False if there's an error
-            for feature in VersionSupport.FEATURE_SUPPORT[platform]:
-                features[feature] = False
-                
-        return features
+            platform = "android" if device_info.type == DeviceType.ANDROID else "ios"
+            return {feature: False for feature in VersionSupport.FEATURE_SUPPORT[platform]}
 
     def get_device_compatibility(self, device_id: str) -> Tuple[bool, Dict[str, bool]]:
         """Get device compatibility and feature support"""
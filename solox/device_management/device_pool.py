@@ -3,48 +3,193 @@ Enhanced device management module for SoloX
 Supports device pooling, reconnection handling, and newer iOS/Android versions
 """
 
+import sys
 import time
 import logging
-from typing import Dict, List, Optional, Tuple
+import asyncio
+from typing import AsyncIterator, Callable, Container, Dict, List, Optional, Set, Tuple
 from enum import Enum
 import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from dataclasses import dataclass
 import tidevice
 from solox.public.common import Devices
-from adbutils import adb
+from adbutils import AdbClient, adb
+
+# Interned status values, equality checks against them hit the identity fast path
+CONNECTED = sys.intern("connected")
+DISCONNECTED = sys.intern("disconnected")
+
 
 class DeviceType(Enum):
     """Enum for device types"""
     ANDROID = "android"
     IOS = "ios"
 
-@dataclass
+@dataclass(slots=True)
 class DeviceInfo:
     """Data class for storing device information"""
     id: str
     type: DeviceType
     name: str
     version: str
-    status: str = "disconnected"
-    last_seen: float = 0.0
+    status: str = DISCONNECTED
+    last_seen: float = 0.0  # time.monotonic() of the last status update
     reconnect_attempts: int = 0
+    # When a connected device first went missing, 0.0 while present
+    missing_since: float = 0.0
+    # Earliest time the next reconnect attempt may run
+    next_retry_at: float = 0.0
+
+class RWLock:
+    """Readers-writer lock allowing many concurrent readers or a single writer, preferring writers"""
+    
+    def __init__(self):
+        self._cond = threading.Condition(threading.Lock())
+        self._readers = 0
+        self._writer = False
+        self._writers_waiting = 0
+
+    @contextmanager
+    def read(self):
+        """Hold the lock shared with other readers"""
+        with self._cond:
+            while self._writer or self._writers_waiting:
+                self._cond.wait()
+            self._readers += 1
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._readers -= 1
+                if not self._readers:
+                    self._cond.notify_all()
+
+    @contextmanager
+    def write(self):
+        """Hold the lock exclusively"""
+        with self._cond:
+            self._writers_waiting += 1
+            while self._writer or self._readers:
+                self._cond.wait()
+            self._writers_waiting -= 1
+            self._writer = True
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._writer = False
+                self._cond.notify_all()
 
 class DevicePool:
     """Manages a pool of iOS and Android devices with automatic reconnection"""
-    
-    def __init__(self, max_reconnect_attempts: int = 3, reconnect_interval: int = 5):
+
+    # Upper bound in seconds for the exponential reconnect backoff
+    MAX_RECONNECT_BACKOFF = 300
+
+    def __init__(self, max_reconnect_attempts: int = 3, reconnect_interval: int = 5, resync_interval: int = 60,
+                 flap_grace: float = 1.0, adb_client: Optional[AdbClient] = None):
         self.devices: Dict[str, DeviceInfo] = {}
         self.max_reconnect_attempts = max_reconnect_attempts
         self.reconnect_interval = reconnect_interval
-        self.lock = threading.Lock()
+        # Full re-enumeration period while the adb/usbmux event trackers are running
+        self.resync_interval = resync_interval
+        # Seconds a connected device may be missing before it is treated as disconnected
+        self.flap_grace = flap_grace
+        self.lock = RWLock()
         self._monitor_thread = None
+        self._tracker_threads: List[threading.Thread] = []
         self._stop_monitoring = threading.Event()
+        self._wakeup = threading.Event()
+        # Notified on status transitions, has its own lock so waiters never hold the RW lock
+        self._status_cv = threading.Condition()
+        self._usbmux = tidevice.Usbmux()
+        # One adb client for enumeration, tracking and reconnects, the shared adbutils client by default
+        self._adb = adb_client if adb_client is not None else adb
+        # Runs the adb and usbmux enumerations side by side each tick
+        self._enum_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="device-enum")
+        # Reconnect attempts in flight, guarded by the write lock
+        self._reconnect_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="device-reconnect")
+        self._reconnecting: Set[str] = set()
+        # Presence as of the last resync/event, so a resync only touches devices whose presence changed
+        self._prev_android: Set[str] = set()
+        self._prev_ios: Set[str] = set()
+        # Registered devices not currently connected, revisited every resync for reconnects
+        self._disconnected_ids: Set[str] = set()
+        # Registered devices currently connected, rechecked whenever an enumeration doesn't list them
+        self._connected_ids: Set[str] = set()
+        # Registered devices per platform, a platform with none isn't enumerated
+        self._counts: Dict[DeviceType, int] = {DeviceType.ANDROID: 0, DeviceType.IOS: 0}
+        self._changes_lock = threading.Lock()
+        self._changed_devices: Set[str] = set()
+        self.change_event = threading.Event()
+        # Status change subscribers, events are queued under the write lock and dispatched after it
+        self._subscribers: List[Callable[[DeviceInfo, str], None]] = []
+        self._subscribers_lock = threading.Lock()
+        self._pending_events: List[Tuple[DeviceInfo, str]] = []
+        # Bumped whenever devices are added or removed
+        self.topology_version = 0
+        self._snapshot_cache = None
         self.logger = logging.getLogger(__name__)
 
+    def _read_lock(self):
+        """Shared lock for read-only access to the device table"""
+        return self.lock.read()
+
+    @contextmanager
+    def _write_lock(self):
+        """Exclusive lock for mutating the device table, status events are dispatched once it's released"""
+        with self.lock.write():
+            yield
+            events, self._pending_events = self._pending_events, []
+        self._dispatch_events(events)
+
+    def _dispatch_events(self, events: List[Tuple[DeviceInfo, str]]):
+        """Deliver status events to subscribers, never while holding the table lock"""
+        if not events:
+            return
+        with self._subscribers_lock:
+            subscribers = list(self._subscribers)
+        for device, status in events:
+            for callback in subscribers:
+                try:
+                    callback(device, status)
+                except Exception as e:
+                    self.logger.error(f"Error in device status subscriber {callback!r}: {e}")
+
+    def subscribe(self, callback: Callable[[DeviceInfo, str], None]):
+        """Register a callback invoked as callback(device, status) on every status change"""
+        with self._subscribers_lock:
+            self._subscribers.append(callback)
+
+    def unsubscribe(self, callback: Callable[[DeviceInfo, str], None]):
+        """Remove a callback registered with subscribe"""
+        with self._subscribers_lock:
+            if callback in self._subscribers:
+                self._subscribers.remove(callback)
+
+    async def changes(self) -> AsyncIterator[DeviceInfo]:
+        """Asynchronously iterate over devices as their status changes"""
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+
+        def forward(device: DeviceInfo, status: str):
+            loop.call_soon_threadsafe(queue.put_nowait, device)
+
+        self.subscribe(forward)
+        try:
+            while True:
+                yield await queue.get()
+        finally:
+            self.unsubscribe(forward)
+
     def start_monitoring(self):
         """Start monitoring device connections"""
         if self._monitor_thread is None:
-            self._stop_monitoring.clear()
+            # Trackers block on their sockets and can't be joined, so each run gets its own stop flag
+            self._stop_monitoring = threading.Event()
+            self._wakeup.clear()
             self._monitor_thread = threading.Thread(target=self._monitor_devices)
             self._monitor_thread.daemon = True
             self._monitor_thread.start()
@@ -54,85 +199,254 @@ class DevicePool:
         """Stop monitoring device connections"""
         if self._monitor_thread is not None:
             self._stop_monitoring.set()
+            self._wakeup.set()
             self._monitor_thread.join()
             self._monitor_thread = None
+            self._tracker_threads = []
             self.logger.info("Device monitoring stopped")
 
     def _monitor_devices(self):
-        """Monitor device connections and handle reconnections"""
-        while not self._stop_monitoring.is_set():
+        """Track device connection events, resyncing periodically and handling reconnections"""
+        stop = self._stop_monitoring
+        # Initial full sync before trackers start, so their events always apply on top of it
+        self._update_device_statuses()
+        self._tracker_threads = [
+            threading.Thread(target=self._track_android_devices, args=(stop,), daemon=True),
+            threading.Thread(target=self._track_ios_devices, args=(stop,), daemon=True)
+        ]
+        for tracker in self._tracker_threads:
+            tracker.start()
+        while True:
+            # Trackers push changes as they happen, so only poll at the reconnect rate if one has died
+            tracking = all(tracker.is_alive() for tracker in self._tracker_threads)
+            self._wakeup.wait(self.resync_interval if tracking else self.reconnect_interval)
+            self._wakeup.clear()
+            if stop.is_set():
+                break
             self._update_device_statuses()
-            time.sleep(self.reconnect_interval)
+
+    def _track_android_devices(self, stop: threading.Event):
+        """Apply adb track-devices events until monitoring stops"""
+        try:
+            for event in self._adb.track_devices():
+                if stop.is_set():
+                    return
+                self._apply_device_event(event.serial, DeviceType.ANDROID, event.present and event.status == "device")
+        except Exception as e:
+            if not stop.is_set():
+                self.logger.warning(f"Android device tracking unavailable, falling back to polling: {e}")
+        finally:
+            self._wakeup.set()
+
+    def _track_ios_devices(self, stop: threading.Event):
+        """Apply usbmuxd attach/detach events until monitoring stops"""
+        # usbmuxd reports detaches by DeviceID only; a udid may be attached over USB and network at once
+        attached: Dict[str, Set[int]] = {}
+        udids: Dict[int, str] = {}
+        try:
+            for data in self._usbmux.watch_device():
+                if stop.is_set():
+                    return
+                if data.get('MessageType') == 'Attached':
+                    udid = data['Properties']['SerialNumber']
+                    udids[data['DeviceID']] = udid
+                    attached.setdefault(udid, set()).add(data['DeviceID'])
+                    self._apply_device_event(udid, DeviceType.IOS, True)
+                elif data.get('MessageType') == 'Detached':
+                    udid = udids.pop(data['DeviceID'], None)
+                    if udid is None:
+                        continue
+                    attached[udid].discard(data['DeviceID'])
+                    if not attached[udid]:
+                        del attached[udid]
+                        self._apply_device_event(udid, DeviceType.IOS, False)
+        except Exception as e:
+            if not stop.is_set():
+                self.logger.warning(f"iOS device tracking unavailable, falling back to polling: {e}")
+        finally:
+            self._wakeup.set()
+
+    def _apply_device_event(self, device_id: str, device_type: DeviceType, present: bool):
+        """Update a registered device from a tracker event"""
+        with self._write_lock():
+            device = self.devices.get(device_id)
+            if device is None or device.type != device_type:
+                return
+            seen = self._prev_android if device_type == DeviceType.ANDROID else self._prev_ios
+            if present:
+                seen.add(device_id)
+                self._update_device_status(device_id, CONNECTED, time.monotonic())
+            else:
+                seen.discard(device_id)
+                self._mark_missing(device_id, time.monotonic())
 
     def _update_device_statuses(self):
         """Update status of all registered devices"""
-        with self.lock:
-            # Check Android devices
-            android_devices = {dev.serial: dev for dev in adb.device_list()}
-            
-            # Check iOS devices
-            ios_devices = {}
+        # Enumerate outside the lock so readers aren't blocked on adb/usbmux round-trips,
+        # querying both daemons concurrently and skipping platforms with no registered devices
+        android_future = ios_future = None
+        if self._counts[DeviceType.ANDROID]:
+            android_future = self._enum_pool.submit(self._adb.device_list)
+        if self._counts[DeviceType.IOS]:
+            ios_future = self._enum_pool.submit(lambda: list(self._usbmux.devices()))
+
+        # Check Android devices
+        android_devices = {}
+        if android_future is not None:
+            android_devices = {dev.serial: dev for dev in android_future.result()}
+        
+        # Check iOS devices
+        ios_devices = {}
+        if ios_future is not None:
             try:
-                for dev in tidevice.Usbmux().devices():
+                for dev in ios_future.result():
                     ios_devices[dev.udid] = dev
             except Exception as e:
                 self.logger.error(f"Error checking iOS devices: {e}")
 
+        with self._write_lock():
+            # Only devices whose presence flipped since the last pass, plus those still awaiting reconnection
+            android_ids = android_devices.keys()
+            ios_ids = ios_devices.keys()
+            candidates = (self._prev_android ^ android_ids) | (self._prev_ios ^ ios_ids)
+            candidates |= self._disconnected_ids
+            # and connected devices this tick didn't list, e.g. marked connected while absent
+            candidates |= self._connected_ids - android_ids - ios_ids
+
             # Update device statuses
-            current_time = time.time()
-            for device_id, device_info in self.devices.items():
+            current_time = time.monotonic()
+            for device_id in candidates:
+                device_info = self.devices.get(device_id)
+                if device_info is None:
+                    continue
                 if device_info.type == DeviceType.ANDROID:
                     if device_id in android_devices:
-                        self._update_device_status(device_id, "connected", current_time)
+                        self._update_device_status(device_id, CONNECTED, current_time)
                     else:
-                        self._handle_disconnected_device(device_id, current_time)
+                        self._mark_missing(device_id, current_time, android_devices)
                 else:  # iOS device
                     if device_id in ios_devices:
-                        self._update_device_status(device_id, "connected", current_time)
+                        self._update_device_status(device_id, CONNECTED, current_time)
                     else:
-                        self._handle_disconnected_device(device_id, current_time)
+                        self._mark_missing(device_id, current_time, ios_devices)
+
+            self._prev_android = set(android_ids)
+            self._prev_ios = set(ios_ids)
 
     def _update_device_status(self, device_id: str, status: str, timestamp: float):
         """Update device status and reset reconnection attempts if connected"""
         device = self.devices[device_id]
-        if device.status != status:
+        changed = device.status != status
+        if changed:
             self.logger.info(f"Device {device_id} status changed to {status}")
+            self.mark_changed(device_id)
         device.status = status
         device.last_seen = timestamp
-        if status == "connected":
+        if status == CONNECTED:
             device.reconnect_attempts = 0
+            device.missing_since = 0.0
+            device.next_retry_at = 0.0
+            self._disconnected_ids.discard(device_id)
+            self._connected_ids.add(device_id)
+        else:
+            self._disconnected_ids.add(device_id)
+            self._connected_ids.discard(device_id)
+        if changed:
+            self._pending_events.append((device, status))
+            with self._status_cv:
+                self._status_cv.notify_all()
 
-    def _handle_disconnected_device(self, device_id: str, timestamp: float):
-        """Handle disconnected device and attempt reconnection"""
+    def _mark_missing(self, device_id: str, timestamp: float, present: Optional[Container[str]] = None):
+        """Debounce a missing device, only disconnecting it once it stays gone for flap_grace seconds"""
         device = self.devices[device_id]
-        if device.status == "connected":
+        if device.status != CONNECTED:
+            self._handle_disconnected_device(device_id, timestamp, present)
+        elif not device.missing_since:
+            device.missing_since = timestamp
+            timer = threading.Timer(self.flap_grace, self._confirm_missing, args=(device_id,))
+            timer.daemon = True
+            timer.start()
+        elif timestamp - device.missing_since >= self.flap_grace:
+            self._handle_disconnected_device(device_id, timestamp, present)
+
+    def _confirm_missing(self, device_id: str):
+        """Disconnect a device whose grace window expired without it reappearing"""
+        with self._write_lock():
+            device = self.devices.get(device_id)
+            now = time.monotonic()
+            # missing_since may belong to a later absence if the device came back and left again,
+            # that one's own timer will fire once its grace runs out
+            if (device is not None and device.missing_since and device.status == CONNECTED
+                    and now - device.missing_since >= self.flap_grace):
+                self._handle_disconnected_device(device_id, now)
+
+    def _handle_disconnected_device(self, device_id: str, timestamp: float, present: Optional[Container[str]] = None):
+        """Handle disconnected device and attempt reconnection, present is the latest enumeration if known"""
+        device = self.devices[device_id]
+        if device.status == CONNECTED:
             self.logger.warning(f"Device {device_id} disconnected")
-            device.status = "disconnected"
+            device.status = DISCONNECTED
+            self.mark_changed(device_id)
+            self._pending_events.append((device, DISCONNECTED))
+        self._disconnected_ids.add(device_id)
+        self._connected_ids.discard(device_id)
         
+        if timestamp < device.next_retry_at or device_id in self._reconnecting:
+            return
         if device.reconnect_attempts < self.max_reconnect_attempts:
             device.reconnect_attempts += 1
             self.logger.info(f"Attempting to reconnect device {device_id} (attempt {device.reconnect_attempts})")
-            if self._try_reconnect(device):
-                self._update_device_status(device_id, "connected", timestamp)
+            # Reconnecting can block on network negotiation, so it runs off the monitor thread
+            self._reconnecting.add(device_id)
+            self._reconnect_pool.submit(self._do_reconnect, device, timestamp, present)
+
+    def _do_reconnect(self, device: DeviceInfo, timestamp: float, present: Optional[Container[str]] = None):
+        """Run one reconnect attempt outside the lock, then record its outcome"""
+        connected = self._try_reconnect(device, present)
+        with self._write_lock():
+            self._reconnecting.discard(device.id)
+            if self.devices.get(device.id) is not device:
+                return  # Removed from the pool while reconnecting
+            if connected:
+                self._update_device_status(device.id, CONNECTED, time.monotonic())
             else:
                 device.last_seen = timestamp
+                backoff = min(self.reconnect_interval * (2 ** device.reconnect_attempts), self.MAX_RECONNECT_BACKOFF)
+                device.next_retry_at = timestamp + backoff
 
-    def _try_reconnect(self, device: DeviceInfo) -> bool:
+    def _try_reconnect(self, device: DeviceInfo, present: Optional[Container[str]] = None) -> bool:
         """Attempt to reconnect to a device"""
         try:
             if device.type == DeviceType.ANDROID:
-                adb.connect(device.id)
-                return True
+                # connect() reports "unable to connect" in its return value, only a listing proves it's back
+                self._adb.connect(device.id)
+                return device.id in {d.serial for d in self._adb.device_list()}
             else:  # iOS device
-                # For iOS, we just check if it's visible to tidevice
-                return device.id in [d.udid for d in tidevice.Usbmux().devices()]
+                # For iOS, we just check if it's visible to tidevice, reusing this tick's enumeration
+                if present is not None:
+                    return device.id in present
+                return device.id in {d.udid for d in self._usbmux.devices()}
         except Exception as e:
             self.logger.error(f"Error reconnecting to device {device.id}: {e}")
             return False
 
+    def mark_changed(self, device_id: str):
+        """Record a device state transition and wake up any waiters"""
+        with self._changes_lock:
+            self._changed_devices.add(device_id)
+            self.change_event.set()
+
+    def wait_for_changes(self, timeout: Optional[float] = None) -> Set[str]:
+        """Block until a device changes state or timeout expires, return the changed device ids"""
+        self.change_event.wait(timeout)
+        with self._changes_lock:
+            self.change_event.clear()
+            changed, self._changed_devices = self._changed_devices, set()
+        return changed
+
     def add_device(self, device_id: str, device_type: DeviceType, name: str, version: str) -> bool:
         """Add a new device to the pool"""
-        with self.lock:
+        with self._write_lock():
             if device_id not in self.devices:
                 self.devices[device_id] = DeviceInfo(
                     id=device_id,
@@ -140,40 +454,167 @@ class DevicePool:
                     name=name,
                     version=version
                 )
+                self._disconnected_ids.add(device_id)
+                self._counts[device_type] += 1
+                self.topology_version += 1
                 self.logger.info(f"Added {device_type.value} device: {device_id} ({name}, {version})")
                 return True
             return False
 
     def remove_device(self, device_id: str) -> bool:
         """Remove a device from the pool"""
-        with self.lock:
+        with self._write_lock():
             if device_id in self.devices:
-                del self.devices[device_id]
+                self._counts[self.devices.pop(device_id).type] -= 1
+                self._disconnected_ids.discard(device_id)
+                self._connected_ids.discard(device_id)
+                self.topology_version += 1
                 self.logger.info(f"Removed device: {device_id}")
                 return True
             return False
 
     def get_device_info(self, device_id: str) -> Optional[DeviceInfo]:
         """Get information about a specific device"""
-        with self.lock:
-            return self.devices.get(device_id)
+        # A single dict lookup is atomic and writers never leave the table half-updated
+        return self.devices.get(device_id)
 
     def get_all_devices(self) -> List[DeviceInfo]:
         """Get information about all devices"""
-        with self.lock:
+        with self._read_lock():
             return list(self.devices.values())
 
+    def snapshot(self, device_ids: List[str]) -> Dict[str, DeviceInfo]:
+        """Get a device id to info mapping, reused until devices are added or removed"""
+        key = tuple(device_ids)
+        with self._read_lock():
+            cached = self._snapshot_cache
+            if cached is not None and cached[0] == self.topology_version and cached[1] == key:
+                return cached[2]
+            devices = {device_id: self.devices.get(device_id) for device_id in key}
+            self._snapshot_cache = (self.topology_version, key, devices)
+            return devices
+
     def get_connected_devices(self) -> List[DeviceInfo]:
         """Get list of currently connected devices"""
-        with self.lock:
-            return [dev for dev in self.devices.values() if dev.status == "connected"]
+        # Copy under the lock and filter outside it to keep the critical section short
+        with self._read_lock():
+            devices = list(self.devices.values())
+        return [dev for dev in devices if dev.status == CONNECTED]
 
     def wait_for_device(self, device_id: str, timeout: int = 30) -> bool:
         """Wait for a specific device to become available"""
-        start_time = time.time()
-        while time.time() - start_time < timeout:
-            device = self.get_device_info(device_id)
-            if device and device.status == "connected":
-                return True
-            time.sleep(1)
-        return False 
\ No newline at end of file
+        def is_connected():
+            # Plain dict read, taking the RW lock here could deadlock against a notifying writer
+            device = self.devices.get(device_id)
+            return device is not None and device.status == CONNECTED
+
+        with self._status_cv:
+            return self._status_cv.wait_for(is_connected, timeout=timeout)
+
+
+class AsyncDevicePool(DevicePool):
+    """DevicePool driven from an asyncio event loop, waiting on devices without a thread per waiter"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._monitor_task: Optional[asyncio.Task] = None
+        self._async_wakeup: Optional[asyncio.Event] = None
+        # Set while the device is connected, only touched from the event loop
+        self._status_events: Dict[str, asyncio.Event] = {}
+        self.subscribe(self._on_status_change)
+
+    async def start_monitoring(self):
+        """Start monitoring device connections on the running event loop"""
+        if self._monitor_task is None:
+            self._loop = asyncio.get_running_loop()
+            self._stop_monitoring = threading.Event()
+            self._async_wakeup = asyncio.Event()
+            self._monitor_task = asyncio.create_task(self._monitor_devices_async(self._stop_monitoring))
+            self.logger.info("Device monitoring started")
+
+    async def stop_monitoring(self):
+        """Stop monitoring device connections"""
+        if self._monitor_task is not None:
+            self._stop_monitoring.set()
+            self._monitor_task.cancel()
+            try:
+                await self._monitor_task
+            except asyncio.CancelledError:
+                pass
+            self._monitor_task = None
+            self._tracker_threads = []
+            self.logger.info("Device monitoring stopped")
+
+    async def _monitor_devices_async(self, stop: threading.Event):
+        """Async counterpart of _monitor_devices, blocking calls run in worker threads"""
+        await asyncio.to_thread(self._update_device_statuses)
+        # The adb/usbmux trackers are blocking generators, each keeps one daemon thread regardless of waiters
+        self._tracker_threads = [
+            threading.Thread(target=self._run_tracker, args=(self._track_android_devices, stop), daemon=True),
+            threading.Thread(target=self._run_tracker, args=(self._track_ios_devices, stop), daemon=True)
+        ]
+        for tracker in self._tracker_threads:
+            tracker.start()
+        while not stop.is_set():
+            tracking = all(tracker.is_alive() for tracker in self._tracker_threads)
+            try:
+                await asyncio.wait_for(self._async_wakeup.wait(),
+                                       self.resync_interval if tracking else self.reconnect_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._async_wakeup.clear()
+            if stop.is_set():
+                break
+            try:
+                await asyncio.to_thread(self._update_device_statuses)
+            except Exception as e:
+                self.logger.error(f"Error updating device statuses: {e}")
+
+    def _run_tracker(self, tracker: Callable[[threading.Event], None], stop: threading.Event):
+        """Run a tracker thread and wake the monitor task when it exits"""
+        try:
+            tracker(stop)
+        finally:
+            self._call_in_loop(self._async_wakeup.set)
+
+    def _call_in_loop(self, callback: Callable, *args):
+        """Schedule callback on the pool's event loop from any thread"""
+        loop = self._loop
+        if loop is not None and not loop.is_closed():
+            try:
+                loop.call_soon_threadsafe(callback, *args)
+            except RuntimeError:
+                pass  # Loop closed in the meantime
+
+    def _on_status_change(self, device: DeviceInfo, status: str):
+        """Subscriber forwarding status changes to the per-device events"""
+        self._call_in_loop(self._set_status_event, device.id, status)
+
+    def _status_event(self, device_id: str) -> asyncio.Event:
+        """Get the connected event of a device, seeded from its current status"""
+        event = self._status_events.get(device_id)
+        if event is None:
+            event = self._status_events[device_id] = asyncio.Event()
+            device = self.devices.get(device_id)
+            if device is not None and device.status == CONNECTED:
+                event.set()
+        return event
+
+    def _set_status_event(self, device_id: str, status: str):
+        """Mirror a status change onto the device's connected event"""
+        event = self._status_event(device_id)
+        if status == CONNECTED:
+            event.set()
+        else:
+            event.clear()
+
+    async def wait_for_device(self, device_id: str, timeout: int = 30) -> bool:
+        """Wait for a specific device to become available"""
+        if self._loop is None:
+            self._loop = asyncio.get_running_loop()
+        try:
+            await asyncio.wait_for(self._status_event(device_id).wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
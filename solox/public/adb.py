@@ -9,8 +9,11 @@
 """
 import os
 import platform
+import queue
 import stat
 import subprocess
+import threading
+import time
 
 STATICPATH = os.path.dirname(os.path.realpath(__file__))
 DEFAULT_ADB_PATH = {
@@ -93,4 +96,82 @@ class ADB(object):
 
 
 
+
+class AdbShellSession(object):
+    """
+    A long-lived `adb shell` on one device, so commands skip the adb process start and handshake
+    """
+
+    SENTINEL = '__SOLOX_END__'
+    # Seconds a command may take before the session is dropped, same budget as a one-off adb call
+    TIMEOUT = 10
+
+    def __init__(self, adb_path, deviceId):
+        self.adb_path = adb_path
+        self.deviceId = deviceId
+        self._proc = None
+        self._lines = None
+        self._lock = threading.Lock()
+
+    def open(self):
+        self.close()
+        self._proc = subprocess.Popen([self.adb_path, '-s', self.deviceId, 'shell'],
+                                      stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+        # Pipes can't be polled portably (no select() on Windows), a reader thread lets run() wait with a deadline
+        self._lines = queue.Queue()
+        threading.Thread(target=self._pump, args=(self._proc.stdout, self._lines), daemon=True).start()
+
+    @staticmethod
+    def _pump(stdout, lines):
+        """Forward the session's output lines, None marks the end of the stream"""
+        for line in iter(stdout.readline, b''):
+            lines.put(line)
+        lines.put(None)
+
+    def run(self, cmd, timeout=None):
+        """
+        Run cmd in the session and return its stripped stdout
+        :param cmd: shell command line, must not read from stdin
+        :param timeout: seconds to wait for the command, TIMEOUT by default
+        :return:
+        """
+        deadline = time.monotonic() + (self.TIMEOUT if timeout is None else timeout)
+        with self._lock:
+            if self._proc is None or self._proc.poll() is not None:
+                self.open()
+            try:
+                self._proc.stdin.write(f'{cmd}\necho {self.SENTINEL}$?\n'.encode('utf-8'))
+                self._proc.stdin.flush()
+                lines = []
+                while True:
+                    try:
+                        line = self._lines.get(timeout=max(deadline - time.monotonic(), 0))
+                    except queue.Empty:
+                        # The command is stuck and won't see stdin close, kill it so the next call reopens
+                        self._proc.kill()
+                        raise TimeoutError(f'adb shell {cmd} on {self.deviceId} timed out')
+                    if line is None:
+                        raise RuntimeError(f'adb shell session to {self.deviceId} closed')
+                    line = line.decode('utf-8', errors='replace')
+                    # Output without a trailing newline runs straight into the sentinel
+                    index = line.find(self.SENTINEL)
+                    if index >= 0:
+                        lines.append(line[:index])
+                        break
+                    lines.append(line)
+            except Exception:
+                self.close()
+                raise
+        return ''.join(lines).replace('\r\n', '\n').strip()
+
+    def close(self):
+        proc, self._proc = self._proc, None
+        if proc is not None and proc.poll() is None:
+            try:
+                proc.stdin.close()
+                proc.wait(timeout=1)
+            except Exception:
+                proc.kill()
+
+
 adb = ADB()
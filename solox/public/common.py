@@ -2,24 +2,123 @@ import json
 import os
 import platform
 import re
-import shutil
+import shlex
+import subprocess
+import threading
 import time
+import atexit
+import copy
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
 import requests
 from logzero import logger
 from tqdm import tqdm
 import socket
 from urllib.request import urlopen
 import ssl
-import xlwt
 import psutil
 import signal
-import cv2
-from functools import wraps
-from jinja2 import Environment, FileSystemLoader
+from functools import lru_cache, wraps
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, TemplateError
 from tidevice._device import Device
 from tidevice import Usbmux
-from solox.public.adb import adb
+from solox.public.adb import adb, AdbShellSession
 
+try:
+    # orjson decodes several times faster than the stdlib when it's installed
+    from orjson import loads as _json_loads
+except ImportError:
+    _json_loads = json.loads
+
+
+# Host facts and patterns used on every device query, resolved once at import
+_IS_WINDOWS = platform.system() == 'Windows'
+_DEVICE_INFO_RE = re.compile(r"\(.*?\)|\{.*?\}|\[.*?\]")
+# Extensions of the per-run files collected in the report dir, anything else there is a scene folder
+SESSION_FILE_EXTS = frozenset({'log', 'json', 'mkv'})
+# Package name fragments that can't be profiled
+_PKG_BLACKLIST = ('com.google',)
+
+@lru_cache(maxsize=1)
+def _report_env():
+    """Jinja environment for the HTML reports, shared so templates are compiled once per process"""
+    STATICPATH = os.path.dirname(os.path.realpath(__file__))
+    return Environment(loader=FileSystemLoader(os.path.join(STATICPATH, 'report_template')),
+                       bytecode_cache=FileSystemBytecodeCache(), auto_reload=False)
+
+_LOCAL_IP_LOCK = threading.Lock()
+
+@lru_cache(maxsize=1)
+def _local_ip():
+    """The host's outbound IP, cached for the process (failures raise and aren't cached)"""
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as s:
+        s.connect(('8.8.8.8', 80))
+        return s.getsockname()[0]
+
+def _fadvise(f, advice):
+    """Page-cache hint for a log read, a no-op where posix_fadvise isn't available (Windows, macOS)"""
+    if hasattr(os, 'posix_fadvise'):
+        try:
+            os.posix_fadvise(f.fileno(), 0, 0, getattr(os, advice))
+        except OSError:
+            pass
+
+def _iter_lines(path):
+    """Yield the raw byte lines of a file, streamed through the read buffer so memory stays flat"""
+    with open(path, 'rb') as f:
+        _fadvise(f, 'POSIX_FADV_SEQUENTIAL')
+        yield from f
+        # the parsed result is cached, the pages won't be read again
+        _fadvise(f, 'POSIX_FADV_DONTNEED')
+
+# Shared result for missing or empty apmlog files
+_EMPTY_LOG = ((), np.empty(0))
+_EMPTY_LOG[1].flags.writeable = False
+
+@lru_cache(maxsize=256)
+def _parse_log(path, mtime_ns, size):
+    """Parsed (timestamps, values) columns of an apmlog file, keyed on its mtime and size
+
+    The size catches appends that land within one tick of a coarse mtime (FAT/exFAT, SMB shares).
+
+    The values array is frozen because the cached result is shared between callers.
+    """
+    xs = list()
+    ys = list()
+    try:
+        for line in _iter_lines(path):
+            key, sep, val = line.partition(b'=')
+            if not sep:
+                continue
+            # float() accepts bytes and surrounding whitespace, only the key is decoded
+            y = float(val)
+            xs.append(key.strip().decode())
+            ys.append(y)
+    except OSError as e:
+        logger.error(f"Error reading file {path}: {str(e)}")
+    values = np.array(ys) if ys else np.empty(0)
+    values.flags.writeable = False
+    return tuple(xs), values
+
+@lru_cache(maxsize=4096)
+def _read_json_cached(path, mtime_ns, size):
+    """Parsed JSON for a file, keyed on its mtime and size so a rewrite invalidates the entry"""
+    with open(path, 'rb') as f:
+        return _json_loads(f.read())
+
+def read_json_cached(path, st=None):
+    """Parsed JSON of a file, only re-read when it changes
+
+    The result is shared between callers and must not be modified. st is the file's
+    os.stat() result when the caller already has it.
+    """
+    if st is None:
+        st = os.stat(path)
+    return _read_json_cached(path, st.st_mtime_ns, st.st_size)
+
+def _load_json(path):
+    """Private copy of a JSON file's content, served from the mtime cache"""
+    return copy.deepcopy(read_json_cached(path))
 
 class Platform:
     Android = 'Android'
@@ -29,55 +128,207 @@ class Platform:
 
 class Devices:
 
+    # One `[key]: [value]` line of a full getprop dump
+    _PROP_LINE = re.compile(r'^\[(.+?)\]:\s*\[(.*?)\]\s*$', re.M)
+
+    # Seconds a `adb devices` listing is reused by back-to-back callers
+    DEVICE_IDS_TTL = 2
+    # Seconds an iOS installed-apps listing is reused, apps change far less often than the UI refreshes
+    IOS_APPS_TTL = 30
+
     def __init__(self, platform=Platform.Android):
         self.platform = platform
         self.adb = adb.adb_path
+        # Static per-device values (getprop results, cpu cores) that don't change while connected
+        self._static_props = {}
+        self._device_ids_cache = None
+        # Persistent `adb shell` per device, reused by every per-device command
+        self._sessions = {}
+        self._sessions_lock = threading.Lock()
+        atexit.register(self.close_sessions)
+        # iOS Device handles and their static lockdown/screen info, keyed by udid
+        self._ios_devices = {}
+        self._ios_info = {}
+        self._ios_apps = {}
 
-    def execCmd(self, cmd):
-        """Execute the command to get the terminal print result"""
-        r = os.popen(cmd)
+    def invalidate(self, deviceId=None):
+        """Drop cached device data, for one device or all of them"""
+        if deviceId is None:
+            self._static_props.clear()
+            self._device_ids_cache = None
+            self.close_sessions()
+            self._ios_devices.clear()
+            self._ios_info.clear()
+            self._ios_apps.clear()
+        else:
+            self._static_props.pop(deviceId, None)
+            self.close_sessions(deviceId)
+            self._forget_ios(deviceId)
+
+    def _forget_ios(self, udid):
+        self._ios_devices.pop(udid, None)
+        self._ios_info.pop(udid, None)
+        self._ios_apps.pop(udid, None)
+
+    def _ios_device(self, udid):
+        """Get the tidevice Device of a udid, reusing it across calls"""
+        device = self._ios_devices.get(udid)
+        if device is None:
+            device = self._ios_devices[udid] = Device(udid)
+        return device
+
+    def _ios_static(self, udid, key, fetch):
+        """Get static iOS info such as device_info/screen_info, fetching it from the device once"""
+        info = self._ios_info.setdefault(udid, {})
+        if not info.get(key):
+            try:
+                info[key] = fetch(self._ios_device(udid))
+            except Exception:
+                # The handle may be stale after a replug, start over on the next call
+                self._ios_devices.pop(udid, None)
+                raise
+        return info[key]
+
+    def _ios_installed(self, udid):
+        """Get the bundle ids of user apps on an iOS device, reused for IOS_APPS_TTL seconds"""
+        cached = self._ios_apps.get(udid)
+        if cached and time.monotonic() - cached[0] < self.IOS_APPS_TTL:
+            return cached[1]
+        try:
+            pkgNames = [
+                i.get("CFBundleIdentifier")
+                for i in self._ios_device(udid).installation.iter_installed(app_type="User")
+                if i.get("CFBundleIdentifier")
+            ]
+        except Exception:
+            self._ios_devices.pop(udid, None)
+            raise
+        self._ios_apps[udid] = (time.monotonic(), pkgNames)
+        return pkgNames
+
+    def _session(self, deviceId):
+        """Get the persistent adb shell session of a device, starting it on first use"""
+        with self._sessions_lock:
+            session = self._sessions.get(deviceId)
+            if session is None:
+                session = self._sessions[deviceId] = AdbShellSession(self.adb, deviceId)
+            return session
+
+    def close_sessions(self, deviceId=None):
+        """Close the adb shell session of one device, or of all devices"""
+        with self._sessions_lock:
+            if deviceId is None:
+                sessions, self._sessions = list(self._sessions.values()), {}
+            else:
+                session = self._sessions.pop(deviceId, None)
+                sessions = [session] if session else []
+        for session in sessions:
+            session.close()
+
+    def shell(self, deviceId, cmd):
+        """Run a command on the device over its persistent session, '' if the device can't be reached"""
         try:
-            text = r.buffer.read().decode(encoding='gbk').replace('\x1b[0m','').strip()
+            return self._session(deviceId).run(cmd)
+        except Exception as e:
+            logger.debug(f'{deviceId}: adb shell {cmd} failed: {e}')
+            return ''
+
+    def _getprop(self, deviceId, key):
+        """Get a static Android system property, only querying the device once per session"""
+        props = self._static_props.setdefault(deviceId, {})
+        if key not in props:
+            if key.startswith('ro.'):
+                # Read-only props can't change until reboot, so one dump serves all of them
+                props.update(self._batch_getprop(deviceId))
+                return props.get(key, '')
+            value = self.shell(deviceId, f'getprop {key}')
+            if not value:
+                # Don't remember failures, the device may just be unreachable right now
+                return value
+            props[key] = value
+        return props[key]
+
+    def _batch_getprop(self, deviceId, keys=None):
+        """Read the device's read-only props (or just keys) with a single getprop call"""
+        output = self.shell(deviceId, 'getprop')
+        props = {}
+        for key, value in self._PROP_LINE.findall(output):
+            if value and (key in keys if keys else key.startswith('ro.')):
+                props[key] = value
+        return props
+
+    def _run(self, argv, timeout=10):
+        """Run a command without a shell and return its decoded stdout"""
+        try:
+            proc = subprocess.run(argv, capture_output=True, timeout=timeout)
+        except (OSError, subprocess.TimeoutExpired) as e:
+            logger.error(f'{argv[0]} failed: {e}')
+            return ''
+        try:
+            text = proc.stdout.decode('utf-8')
         except UnicodeDecodeError:
-            text = r.buffer.read().decode(encoding='utf-8').replace('\x1b[0m','').strip()
-        finally:
-            r.close()
-        return text
+            # Consoles of Chinese Windows hosts print gbk
+            text = proc.stdout.decode('gbk', errors='replace')
+        return text.strip()
+
+    def execCmd(self, cmd, timeout=None):
+        """Execute the command to get the terminal print result"""
+        argv = shlex.split(cmd) if isinstance(cmd, str) else cmd
+        return self._run(argv, timeout=timeout).replace('\x1b[0m','')
 
     def filterType(self):
         """Select the pipe filtering method according to the system"""
-        filtertype = ('grep', 'findstr')[platform.system() == Platform.Windows]
+        filtertype = 'findstr' if _IS_WINDOWS else 'grep'
         return filtertype
 
     def getDeviceIds(self):
         """Get all connected device ids"""
-        Ids = list(os.popen(f"{self.adb} devices").readlines())
+        cached = self._device_ids_cache
+        if cached and time.monotonic() - cached[0] < self.DEVICE_IDS_TTL:
+            return list(cached[1])
         deviceIds = []
-        for i in range(1, len(Ids) - 1):
-            id, state = Ids[i].strip().split()
-            if state == 'device':
-                deviceIds.append(id)
-        return deviceIds
+        # Skips the 'List of devices attached' header and any daemon startup chatter
+        for line in self._run([self.adb, 'devices']).splitlines():
+            fields = line.split()
+            if len(fields) == 2 and fields[1] == 'device':
+                deviceIds.append(fields[0])
+        # Forget static data of devices that went away, they may come back reflashed
+        for gone in self._static_props.keys() - set(deviceIds):
+            del self._static_props[gone]
+        for gone in self._sessions.keys() - set(deviceIds):
+            self.close_sessions(gone)
+        self._device_ids_cache = (time.monotonic(), deviceIds)
+        return list(deviceIds)
 
     def getDevicesName(self, deviceId):
         """Get the device name of the Android corresponding device ID"""
+        return self._getprop(deviceId, 'ro.product.model')
+
+    def _safeDevicesName(self, deviceId):
+        """getDevicesName that reports an unreachable device with an empty name instead of raising"""
         try:
-            devices_name = os.popen(f'{self.adb} -s {deviceId} shell getprop ro.product.model').readlines()[0].strip()
-        except Exception:
-            devices_name = os.popen(f'{self.adb} -s {deviceId} shell getprop ro.product.model').buffer.readlines()[0].decode("utf-8").strip()
-        return devices_name
+            return self.getDevicesName(deviceId)
+        except Exception as e:
+            logger.warning(f'{deviceId}: get device name failed: {e}')
+            return ''
 
     def getDevices(self):
         """Get all Android devices"""
         DeviceIds = self.getDeviceIds()
-        Devices = [f'{id}({self.getDevicesName(id)})' for id in DeviceIds]
+        if len(DeviceIds) > 1:
+            # Each lookup is an independent adb round-trip, query the devices concurrently
+            with ThreadPoolExecutor(max_workers=min(16, len(DeviceIds))) as executor:
+                names = list(executor.map(self._safeDevicesName, DeviceIds))
+        else:
+            names = [self._safeDevicesName(id) for id in DeviceIds]
+        Devices = [f'{id}({name})' for id, name in zip(DeviceIds, names)]
         logger.info('Connected devices: {}'.format(Devices))
         return Devices
 
     def getIdbyDevice(self, deviceinfo, platform):
         """Obtain the corresponding device id according to the Android device information"""
         if platform == Platform.Android:
-            deviceId = re.sub(u"\\(.*?\\)|\\{.*?}|\\[.*?]", "", deviceinfo)
+            deviceId = _DEVICE_INFO_RE.sub("", deviceinfo)
             if deviceId not in self.getDeviceIds():
                 raise Exception('no device found')
         else:
@@ -85,29 +336,41 @@ class Devices:
         return deviceId
     
     def getSdkVersion(self, deviceId):
-        version = adb.shell(cmd='getprop ro.build.version.sdk', deviceId=deviceId)
+        version = self._getprop(deviceId, 'ro.build.version.sdk')
         return version
     
     def getCpuCores(self, deviceId):
         """get Android cpu cores"""
-        cmd = 'cat /sys/devices/system/cpu/online'
-        result = adb.shell(cmd=cmd, deviceId=deviceId)
-        try:
-            nums = int(result.split('-')[1]) + 1
-        except:
-            nums = 1
+        props = self._static_props.setdefault(deviceId, {})
+        if 'cpu.cores' in props:
+            return props['cpu.cores']
+        # `present` lists every core, `online` drops the ones hotplugged off at the moment
+        cmd = 'cat /sys/devices/system/cpu/present'
+        result = self.shell(deviceId, cmd)
+        nums = 0
+        for cpus in result.split(','):  # e.g. "0-7" or "0-3,6"
+            start, _, end = cpus.strip().partition('-')
+            end = end or start
+            if start.isdigit() and end.isdigit():
+                nums += int(end) - int(start) + 1
+        if nums == 0:
+            return 1
+        props['cpu.cores'] = nums
         return nums
 
     def getPid(self, deviceId, pkgName):
         """Get the pid corresponding to the Android package name"""
         try:
             sdkversion = self.getSdkVersion(deviceId)
+            # Filter the process table here rather than piping through a host-side grep/findstr
             if sdkversion and int(sdkversion) < 26:
-                result = os.popen(f"{self.adb} -s {deviceId} shell ps | {self.filterType()} {pkgName}").readlines()
-                processList = ['{}:{}'.format(process.split()[1],process.split()[8]) for process in result]
+                result = self.shell(deviceId, 'ps').splitlines()
+                nameIndex = 8
             else:
-                result = os.popen(f"{self.adb} -s {deviceId} shell ps -ef | {self.filterType()} {pkgName}").readlines()
-                processList = ['{}:{}'.format(process.split()[1],process.split()[7]) for process in result]
+                result = self.shell(deviceId, 'ps -ef').splitlines()
+                nameIndex = 7
+            processes = [line.split() for line in result if pkgName in line]
+            processList = ['{}:{}'.format(process[1], process[nameIndex]) for process in processes]
             for i in range(len(processList)):
                 if processList[i].count(':') == 1:
                     index = processList.index(processList[i])
@@ -121,27 +384,20 @@ class Devices:
         return processList
 
     def checkPkgname(self, pkgname):
-        flag = True
-        replace_list = ['com.google']
-        for i in replace_list:
-            if i in pkgname:
-                flag = False
-        return flag
+        return not any(i in pkgname for i in _PKG_BLACKLIST)
 
     def getPkgname(self, deviceId):
         """Get all package names of Android devices"""
-        pkginfo = os.popen(f"{self.adb} -s {deviceId} shell pm list packages --user 0")
-        pkglist = [p.lstrip('package').lstrip(":").strip() for p in pkginfo]
-        if pkglist.__len__() > 0:
-            return pkglist
-        else:
-            pkginfo = os.popen(f"{self.adb} -s {deviceId} shell pm list packages")
-            pkglist = [p.lstrip('package').lstrip(":").strip() for p in pkginfo]
-            return pkglist
+        # Older pm builds reject --user, fall back on the device within the same round-trip
+        pkginfo = self.shell(deviceId, 'pm list packages --user 0 2>/dev/null || pm list packages').splitlines()
+        pkglist = [p.removeprefix('package:').strip() for p in pkginfo if p.startswith('package:')]
+        return pkglist
 
     def getDeviceInfoByiOS(self):
         """Get a list of all successfully connected iOS devices"""
         deviceInfo = [udid for udid in Usbmux().device_udid_list()]
+        for gone in self._ios_devices.keys() - set(deviceInfo):
+            self._forget_ios(gone)
         logger.info('Connected devices: {}'.format(deviceInfo))    
         return deviceInfo
 
@@ -158,16 +414,7 @@ class Devices:
             Exception: If device is not found or error occurs accessing device
         """
         try:
-            d = Device(udid)
-            if not d:
-                logger.error(f"Could not connect to device {udid}")
-                return []
-                
-            pkgNames = [
-                i.get("CFBundleIdentifier") 
-                for i in d.installation.iter_installed(app_type="User") 
-                if i.get("CFBundleIdentifier")
-            ]
+            pkgNames = list(self._ios_installed(udid))
             
             if not pkgNames:
                 logger.warning(f"No user applications found on device {udid}")
@@ -182,22 +429,21 @@ class Devices:
     
     def get_pc_ip(self):
         try:
-            s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-            s.connect(('8.8.8.8', 80))
-            ip = s.getsockname()[0]
+            # lru_cache alone lets concurrent first callers all probe, serialize the miss
+            with _LOCAL_IP_LOCK:
+                ip = _local_ip()
         except Exception:
             logger.error('get local ip failed')
             ip = '127.0.0.1'
-        finally:
-            s.close()
         return ip
     
     def get_device_ip(self, deviceId):
-        content = os.popen(f"{self.adb} -s {deviceId} shell ip addr show wlan0").read()
+        # One line per address: `30: wlan0    inet 192.168.1.5/24 brd ... scope global wlan0 ...`
+        content = self.shell(deviceId, 'ip -4 -o addr show wlan0')
         logger.info(content)
-        math_obj = re.search(r'inet\s(\d+\.\d+\.\d+\.\d+).*?wlan0', content)
-        if math_obj and math_obj.group(1):
-            return math_obj.group(1)
+        fields = content.split()
+        if 'inet' in fields[:-1]:
+            return fields[fields.index('inet') + 1].split('/')[0]
         return None
     
     def devicesCheck(self, platform, deviceid=None, pkgname=None):
@@ -212,9 +458,10 @@ class Devices:
             Exception: If no devices found, device not found, or package not found
         """
         if platform == Platform.Android:
-            if len(self.getDeviceIds()) == 0:
+            deviceIds = self.getDeviceIds()
+            if len(deviceIds) == 0:
                 raise Exception('no devices found')
-            if deviceid and deviceid not in self.getDeviceIds():
+            if deviceid and deviceid not in deviceIds:
                 raise Exception('device not found')
             if pkgname and not self.checkPkgname(pkgname):
                 raise Exception('package not found')
@@ -226,13 +473,20 @@ class Devices:
                 raise Exception('device not found')
             if pkgname:
                 try:
-                    d = Device(deviceid)
-                    pkgNames = [i.get("CFBundleIdentifier") for i in d.installation.iter_installed(app_type="User")]
-                    if pkgname not in pkgNames:
-                        raise Exception('package not found')
+                    cached = self._ios_apps.get(deviceid)
+                    if cached and time.monotonic() - cached[0] < self.IOS_APPS_TTL:
+                        found = pkgname in cached[1]
+                    else:
+                        # Stop reading the install manifest at the first match
+                        d = self._ios_device(deviceid)
+                        found = any(i.get("CFBundleIdentifier") == pkgname
+                                    for i in d.installation.iter_installed(app_type="User"))
                 except Exception as e:
+                    self._ios_devices.pop(deviceid, None)
                     logger.error(f"Error checking iOS package: {str(e)}")
                     raise Exception('error checking package')
+                if not found:
+                    raise Exception('package not found')
         else:
             logger.error(f"Unsupported platform: {platform}")
             raise ValueError(f"Unsupported platform: {platform}. Only Android and iOS are supported.")
@@ -254,18 +508,17 @@ class Devices:
         result = dict()
         try:
             if platform == Platform.Android:
-                result['brand'] = adb.shell(cmd='getprop ro.product.brand', deviceId=deviceId)
+                result['brand'] = self._getprop(deviceId, 'ro.product.brand')
                 if not result['brand']:
                     raise Exception('Device not found or error accessing device')
-                result['name'] = adb.shell(cmd='getprop ro.product.model', deviceId=deviceId)
-                result['version'] = adb.shell(cmd='getprop ro.build.version.release', deviceId=deviceId)
-                result['cpu'] = adb.shell(cmd='getprop ro.product.cpu.abi', deviceId=deviceId)
-                result['manufacturer'] = adb.shell(cmd='getprop ro.product.manufacturer', deviceId=deviceId)
-                result['battery'] = adb.shell(cmd='dumpsys battery', deviceId=deviceId)
+                result['name'] = self._getprop(deviceId, 'ro.product.model')
+                result['version'] = self._getprop(deviceId, 'ro.build.version.release')
+                result['cpu'] = self._getprop(deviceId, 'ro.product.cpu.abi')
+                result['manufacturer'] = self._getprop(deviceId, 'ro.product.manufacturer')
+                result['battery'] = self.shell(deviceId, 'dumpsys battery')
             elif platform == Platform.iOS:
                 try:
-                    d = Device(deviceId)
-                    device_info = d.device_info()  # Call it as a method
+                    device_info = self._ios_static(deviceId, 'device_info', lambda d: d.device_info())
                     if not device_info:
                         raise Exception('Device not found or error accessing device')
                     result.update({
@@ -299,8 +552,7 @@ class Devices:
             Exception: If device is not found or error occurs accessing device
         """
         try:
-            ios_device = Device(udid=deviceId)
-            screen_info = ios_device.screen_info()
+            screen_info = self._ios_static(deviceId, 'screen_info', lambda d: d.screen_info())
             if not screen_info:
                 logger.error(f"Could not get screen info for device {deviceId}")
                 return ''
@@ -320,7 +572,8 @@ class Devices:
             return ''
     
     def getCurrentActivity(self, deviceId):
-        result = adb.shell(cmd='dumpsys window | {} mCurrentFocus'.format(self.filterType()), deviceId=deviceId)
+        # The pipe runs in the device shell, which always has grep
+        result = self.shell(deviceId, 'dumpsys window | grep mCurrentFocus')
         if result.__contains__('mCurrentFocus'):
             activity = str(result).split(' ')[-1].replace('}','') 
             return activity
@@ -328,7 +581,7 @@ class Devices:
             raise Exception('No activity found')
 
     def getStartupTimeByAndroid(self, activity, deviceId):
-        result = adb.shell(cmd='am start -W {}'.format(activity), deviceId=deviceId)
+        result = self.shell(deviceId, 'am start -W {}'.format(activity))
         return result
 
     def getStartupTimeByiOS(self, pkgname):
@@ -341,6 +594,19 @@ class Devices:
 
 class File:
 
+    # Append handles shared by every File instance, so collectors don't reopen a log per sample
+    _log_handles = {}
+    _log_lock = threading.Lock()
+    # Baseline (send, recv) of record_net, the web views and collectors share it in-process
+    _pre_net = None
+    _net_lock = threading.Lock()
+    # Battery chart series per platform, response key -> apmlog file
+    _BATTERY_LOGS = {
+        Platform.Android: {'batteryLevel': 'battery_level.log', 'batteryTem': 'battery_tem.log'},
+        Platform.iOS: {'batteryTem': 'battery_tem.log', 'batteryCurrent': 'battery_current.log',
+                       'batteryVoltage': 'battery_voltage.log', 'batteryPower': 'battery_power.log'},
+    }
+
     def __init__(self, fileroot='.'):
         self.fileroot = fileroot
         self.report_dir = self.get_repordir()
@@ -356,15 +622,17 @@ class File:
         """
         try:
             logger.info('Cleaning up temporary files...')
+            self.close_logs()
             if os.path.exists(self.report_dir):
-                for f in os.listdir(self.report_dir):
-                    filename = os.path.join(self.report_dir, f)
-                    if os.path.isfile(filename) and f.split(".")[-1] in ['log', 'json', 'mkv']:
-                        try:
-                            os.remove(filename)
-                            logger.debug(f"Removed file: {filename}")
-                        except OSError as e:
-                            logger.warning(f"Failed to remove file {filename}: {str(e)}")
+                with os.scandir(self.report_dir) as it:
+                    filenames = [entry.path for entry in it
+                                 if entry.is_file(follow_symlinks=False) and entry.name.rpartition('.')[2] in SESSION_FILE_EXTS]
+                for filename in filenames:
+                    try:
+                        os.remove(filename)
+                        logger.debug(f"Removed file: {filename}")
+                    except OSError as e:
+                        logger.warning(f"Failed to remove file {filename}: {str(e)}")
                             
             Scrcpy.stop_record()
             logger.info('Cleanup completed successfully')
@@ -388,6 +656,8 @@ class File:
             ValueError: If platform or scene parameters are invalid
             OSError: If file operations fail
         """
+        from openpyxl import Workbook
+
         if not platform or platform not in [Platform.Android, Platform.iOS]:
             raise ValueError(f"Invalid platform: {platform}. Must be Android or iOS")
         if not scene or not isinstance(scene, str):
@@ -403,29 +673,22 @@ class File:
                             'battery_voltage', 'battery_power', 'upflow', 'downflow', 'fps', 'gpu']
             log_files = android_log_files if platform == Platform.Android else ios_log_files
             
-            # Create workbook and format headers
-            wb = xlwt.Workbook(encoding='utf-8')
-            row_count = 1
+            # Write-only workbook streams rows out instead of keeping every cell in memory
+            wb = Workbook(write_only=True)
             
             # Process each log file
             for name in log_files:
-                ws = wb.add_sheet(name)
-                ws.write(0, 0, 'Time')
-                ws.write(0, 1, 'Value')
-                row = 1
-                col = 0
+                ws = wb.create_sheet(name)
+                ws.append(['Time', 'Value'])
                 
                 log_path = os.path.join(self.report_dir, scene, f'{name}.log')
                 if os.path.exists(log_path):
                     try:
                         with open(log_path, 'r', encoding='utf-8') as f:
                             for line in f:
-                                target = line.strip().split('=')
-                                if len(target) == 2:  # Validate line format
-                                    for i, value in enumerate(target):
-                                        ws.write(row, col + i, value)
-                                    row += 1
-                                    row_count += 1
+                                log_time, sep, value = line.strip().partition('=')
+                                if sep and '=' not in value:  # Validate line format
+                                    ws.append([log_time, value])
                                 else:
                                     logger.warning(f"Skipping invalid line in {name}.log: {line}")
                     except Exception as e:
@@ -433,7 +696,7 @@ class File:
                         continue
                 
             # Save workbook
-            xls_path = os.path.join(self.report_dir, scene, f'{scene}.xls')
+            xls_path = os.path.join(self.report_dir, scene, f'{scene}.xlsx')
             os.makedirs(os.path.dirname(xls_path), exist_ok=True)
             wb.save(xls_path)
             
@@ -474,10 +737,7 @@ class File:
             raise ValueError(f"Missing required fields in summary: {', '.join(missing_fields)}")
             
         try:
-            STATICPATH = os.path.dirname(os.path.realpath(__file__))
-            file_loader = FileSystemLoader(os.path.join(STATICPATH, 'report_template'))
-            env = Environment(loader=file_loader)
-            template = env.get_template('android.html')
+            template = _report_env().get_template('android.html')
             
             if report_path:
                 html_path = report_path
@@ -488,37 +748,13 @@ class File:
             os.makedirs(os.path.dirname(html_path), exist_ok=True)
             
             with open(html_path, 'w+', encoding='utf-8') as fout:
-                html_content = template.render(
-                    devices=summary['devices'],
-                    app=summary['app'],
-                    platform=summary['platform'],
-                    ctime=summary['ctime'],
-                    cpu_app=summary['cpu_app'],
-                    cpu_sys=summary['cpu_sys'],
-                    mem_total=summary['mem_total'],
-                    mem_swap=summary['mem_swap'],
-                    fps=summary['fps'],
-                    jank=summary['jank'],
-                    level=summary['level'],
-                    tem=summary['tem'],
-                    net_send=summary['net_send'],
-                    net_recv=summary['net_recv'],
-                    cpu_charts=summary['cpu_charts'],
-                    mem_charts=summary['mem_charts'],
-                    net_charts=summary['net_charts'],
-                    battery_charts=summary['battery_charts'],
-                    fps_charts=summary['fps_charts'],
-                    jank_charts=summary['jank_charts'],
-                    mem_detail_charts=summary['mem_detail_charts'],
-                    gpu=summary['gpu'],
-                    gpu_charts=summary['gpu_charts']
-                )
-                fout.write(html_content)
+                # Stream the rendered chunks straight to the file instead of building one big string
+                template.stream(**summary).dump(fout)
                 
             logger.info(f'HTML report generated successfully: {html_path}')
             return html_path
             
-        except jinja2.TemplateError as e:
+        except TemplateError as e:
             logger.error(f"Template error while generating HTML: {str(e)}")
             raise
         except OSError as e:
@@ -557,10 +793,7 @@ class File:
             raise ValueError(f"Missing required fields in summary: {', '.join(missing_fields)}")
             
         try:
-            STATICPATH = os.path.dirname(os.path.realpath(__file__))
-            file_loader = FileSystemLoader(os.path.join(STATICPATH, 'report_template'))
-            env = Environment(loader=file_loader)
-            template = env.get_template('ios.html')
+            template = _report_env().get_template('ios.html')
             
             if report_path:
                 html_path = report_path
@@ -571,35 +804,13 @@ class File:
             os.makedirs(os.path.dirname(html_path), exist_ok=True)
             
             with open(html_path, 'w+', encoding='utf-8') as fout:
-                html_content = template.render(
-                    devices=summary['devices'],
-                    app=summary['app'],
-                    platform=summary['platform'],
-                    ctime=summary['ctime'],
-                    cpu_app=summary['cpu_app'],
-                    cpu_sys=summary['cpu_sys'],
-                    gpu=summary['gpu'],
-                    mem_total=summary['mem_total'],
-                    fps=summary['fps'],
-                    tem=summary['tem'],
-                    current=summary['current'],
-                    voltage=summary['voltage'],
-                    power=summary['power'],
-                    net_send=summary['net_send'],
-                    net_recv=summary['net_recv'],
-                    cpu_charts=summary['cpu_charts'],
-                    mem_charts=summary['mem_charts'],
-                    net_charts=summary['net_charts'],
-                    battery_charts=summary['battery_charts'],
-                    fps_charts=summary['fps_charts'],
-                    gpu_charts=summary['gpu_charts']
-                )
-                fout.write(html_content)
+                # Stream the rendered chunks straight to the file instead of building one big string
+                template.stream(**summary).dump(fout)
                 
             logger.info(f'HTML report generated successfully: {html_path}')
             return html_path
             
-        except jinja2.TemplateError as e:
+        except TemplateError as e:
             logger.error(f"Template error while generating HTML: {str(e)}")
             raise
         except OSError as e:
@@ -613,11 +824,10 @@ class File:
     def filter_secen(self, scene):
         """Filter out the current scene from the list of report directories"""
         try:
-            dirs = os.listdir(self.report_dir)
-            dir_list = list(reversed(sorted(dirs, key=lambda x: os.path.getmtime(os.path.join(self.report_dir, x)))))
-            if scene in dir_list:
-                dir_list.remove(scene)
-            return dir_list
+            with os.scandir(self.report_dir) as it:
+                entries = [(entry.name, entry.stat().st_mtime) for entry in it if entry.name != scene]
+            entries.sort(key=lambda entry: entry[1], reverse=True)
+            return [name for name, _ in entries]
         except OSError as e:
             logger.error(f"Error accessing report directory: {str(e)}")
             return []
@@ -647,23 +857,46 @@ class File:
         """Add a timestamped log entry if the value is valid"""
         if value >= 0:
             try:
-                with open(path, 'a+', encoding="utf-8") as file:
+                with File._log_lock:
+                    file = File._log_handles.get(path)
+                    if file is None:
+                        # Line buffered, so readers always see complete samples
+                        file = File._log_handles[path] = open(path, 'a', encoding="utf-8", buffering=1)
                     file.write(f'{log_time}={str(value)}\n')
             except OSError as e:
                 logger.error(f"Error writing to log file {path}: {str(e)}")
+
+    def close_logs(self):
+        """Close the log handles kept open by add_log, before the logs are moved or removed"""
+        with File._log_lock:
+            handles = list(File._log_handles.values())
+            File._log_handles.clear()
+        for file in handles:
+            try:
+                file.close()
+            except OSError as e:
+                logger.warning(f"Error closing log file {file.name}: {str(e)}")
     
     def record_net(self, type, send, recv):
         net_dict = dict()
         if type == 'pre':
             net_dict['send'] = send
             net_dict['recv'] = recv
-            with open(os.path.join(os.getcwd(), 'report/net.json'), 'w') as f:
-                json.dump(net_dict, f)
+            with File._net_lock:
+                File._pre_net = (send, recv)
+                os.makedirs(self.report_dir, exist_ok=True)
+                with open(os.path.join(self.report_dir, 'net.json'), 'w') as f:
+                    json.dump(net_dict, f)
         elif type == 'next':
-            with open(os.path.join(os.getcwd(), 'report/net.json'), 'r') as f:
-                pre_net = json.load(f)
-                net_dict['send'] = send - pre_net['send']
-                net_dict['recv'] = recv - pre_net['recv']
+            with File._net_lock:
+                pre_net = File._pre_net
+                if pre_net is None:
+                    # 'pre' was recorded by another process or before a restart
+                    with open(os.path.join(self.report_dir, 'net.json'), 'r') as f:
+                        saved = json.load(f)
+                    pre_net = File._pre_net = (saved['send'], saved['recv'])
+            net_dict['send'] = send - pre_net[0]
+            net_dict['recv'] = recv - pre_net[1]
         else:
             logger.error(f"Unsupported network record type: {type}")
             raise ValueError(f"Unsupported network record type: {type}. Only 'pre' and 'next' are supported.")
@@ -728,15 +961,17 @@ class File:
                 raise
             
             # Move relevant files to report directory
+            self.close_logs()
             moved_files = []
-            for f in os.listdir(self.report_dir):
-                filename = os.path.join(self.report_dir, f)
-                if os.path.isfile(filename) and f.split(".")[-1] in ['log', 'json', 'mkv']:
-                    try:
-                        shutil.move(filename, report_new_dir)
-                        moved_files.append(f)
-                    except OSError as e:
-                        logger.warning(f"Failed to move file {f}: {str(e)}")
+            with os.scandir(self.report_dir) as it:
+                session_files = [(entry.name, entry.path) for entry in it
+                                 if entry.is_file(follow_symlinks=False) and entry.name.rpartition('.')[2] in SESSION_FILE_EXTS]
+            for f, filename in session_files:
+                try:
+                    os.replace(filename, os.path.join(report_new_dir, f))
+                    moved_files.append(f)
+                except OSError as e:
+                    logger.warning(f"Failed to move file {f}: {str(e)}")
             
             logger.info(f'Report generated successfully: {report_new_dir}')
             logger.debug(f'Moved {len(moved_files)} files to report directory')
@@ -747,14 +982,6 @@ class File:
             logger.exception(e)
             raise
 
-    def instance_type(self, data):
-        if isinstance(data, float):
-            return 'float'
-        elif isinstance(data, int):
-            return 'int'
-        else:
-            return 'int'
-    
     def open_file(self, path, mode):
         """Generator to read file lines efficiently"""
         try:
@@ -769,8 +996,7 @@ class File:
         """Read and parse the result.json file for a given scene"""
         path = os.path.join(self.report_dir, scene, 'result.json')
         try:
-            with open(path, 'r') as f:
-                return json.load(f)
+            return _load_json(path)
         except FileNotFoundError:
             logger.error(f"Result file not found for scene {scene}")
             return {}
@@ -781,220 +1007,141 @@ class File:
             logger.error(f"Error reading result file for scene {scene}: {str(e)}")
             return {}
 
+    def _parseLog(self, scene, filename):
+        path = os.path.join(self.report_dir, scene, filename)
+        try:
+            st = os.stat(path)
+        except OSError:
+            return _EMPTY_LOG
+        # a series that was never sampled (jank on iOS, swap on some ROMs) needs no open or cache slot
+        if st.st_size == 0:
+            return _EMPTY_LOG
+        return _parse_log(path, st.st_mtime_ns, st.st_size)
+
+    def read_log_values(self, scene, filename):
+        """apmlog values as a read-only numpy array for aggregation"""
+        return self._parseLog(scene, filename)[1]
+
+    def read_log_xy(self, scene, filename):
+        """apmlog points as [{'x': time, 'y': value}] for the charts"""
+        xs, ys = self._parseLog(scene, filename)
+        return [{"x": x, "y": y} for x, y in zip(xs, ys.tolist())]
+
+    def _readLogsParallel(self, scene, filenames, reader=None):
+        """Several apmlog files read concurrently to overlap the file I/O, value arrays unless another reader is given"""
+        reader = reader or self.read_log_values
+        with ThreadPoolExecutor(max_workers=min(8, len(filenames))) as executor:
+            values = executor.map(lambda filename: reader(scene=scene, filename=filename), filenames)
+            return dict(zip(filenames, values))
+
     def readLog(self, scene, filename):
-        """Read apmlog file data"""
-        log_data_list = list()
-        target_data_list = list()
-        if os.path.exists(os.path.join(self.report_dir,scene,filename)):
-            lines = self.open_file(os.path.join(self.report_dir,scene,filename), "r")
-            for line in lines:
-                if isinstance(line.split('=')[1].strip(), int):
-                    log_data_list.append({
-                        "x": line.split('=')[0].strip(),
-                        "y": int(line.split('=')[1].strip())
-                    })
-                    target_data_list.append(int(line.split('=')[1].strip()))
-                else:
-                    log_data_list.append({
-                        "x": line.split('=')[0].strip(),
-                        "y": float(line.split('=')[1].strip())
-                    })
-                    target_data_list.append(float(line.split('=')[1].strip()))
-        return log_data_list, target_data_list
+        """Read apmlog file data as (points, values)"""
+        xs, ys = self._parseLog(scene, filename)
+        values = ys.tolist()
+        return [{"x": x, "y": y} for x, y in zip(xs, values)], values
         
+    def _compareLog(self, scene1, scene2, filename):
+        """Chart points of the same apmlog in two scenes"""
+        return {'status': 1,
+                'scene1': self.read_log_xy(scene=scene1, filename=filename),
+                'scene2': self.read_log_xy(scene=scene2, filename=filename)}
+
     def getCpuLog(self, platform, scene):
-        targetDic = dict()
-        targetDic['cpuAppData'] = self.readLog(scene=scene, filename='cpu_app.log')[0]
-        targetDic['cpuSysData'] = self.readLog(scene=scene, filename='cpu_sys.log')[0]
-        result = {'status': 1, 'cpuAppData': targetDic['cpuAppData'], 'cpuSysData': targetDic['cpuSysData']}
-        return result
+        return {'status': 1,
+                'cpuAppData': self.read_log_xy(scene=scene, filename='cpu_app.log'),
+                'cpuSysData': self.read_log_xy(scene=scene, filename='cpu_sys.log')}
     
     def getCpuLogCompare(self, platform, scene1, scene2):
-        targetDic = dict()
-        targetDic['scene1'] = self.readLog(scene=scene1, filename='cpu_app.log')[0]
-        targetDic['scene2'] = self.readLog(scene=scene2, filename='cpu_app.log')[0]
-        result = {'status': 1, 'scene1': targetDic['scene1'], 'scene2': targetDic['scene2']}
-        return result
+        return self._compareLog(scene1, scene2, 'cpu_app.log')
     
     def getGpuLog(self, platform, scene):
-        targetDic = dict()
-        targetDic['gpu'] = self.readLog(scene=scene, filename='gpu.log')[0]
-        result = {'status': 1, 'gpu': targetDic['gpu']}
-        return result
+        return {'status': 1, 'gpu': self.read_log_xy(scene=scene, filename='gpu.log')}
     
     def getGpuLogCompare(self, platform, scene1, scene2):
-        targetDic = dict()
-        targetDic['scene1'] = self.readLog(scene=scene1, filename='gpu.log')[0]
-        targetDic['scene2'] = self.readLog(scene=scene2, filename='gpu.log')[0]
-        result = {'status': 1, 'scene1': targetDic['scene1'], 'scene2': targetDic['scene2']}
-        return result
+        return self._compareLog(scene1, scene2, 'gpu.log')
     
     def getMemLog(self, platform, scene):
-        targetDic = dict()
-        targetDic['memTotalData'] = self.readLog(scene=scene, filename='mem_total.log')[0]
+        result = {'status': 1, 'memTotalData': self.read_log_xy(scene=scene, filename='mem_total.log')}
         if platform == Platform.Android:
-            targetDic['memSwapData']  = self.readLog(scene=scene, filename='mem_swap.log')[0]
-            result = {'status': 1, 
-                      'memTotalData': targetDic['memTotalData'], 
-                      'memSwapData': targetDic['memSwapData']}
-        else:
-            result = {'status': 1, 'memTotalData': targetDic['memTotalData']}
+            result['memSwapData'] = self.read_log_xy(scene=scene, filename='mem_swap.log')
         return result
     
     def getMemDetailLog(self, platform, scene):
-        targetDic = dict()
-        targetDic['java_heap'] = self.readLog(scene=scene, filename='mem_java_heap.log')[0]
-        targetDic['native_heap'] = self.readLog(scene=scene, filename='mem_native_heap.log')[0]
-        targetDic['code_pss'] = self.readLog(scene=scene, filename='mem_code_pss.log')[0]
-        targetDic['stack_pss'] = self.readLog(scene=scene, filename='mem_stack_pss.log')[0]
-        targetDic['graphics_pss'] = self.readLog(scene=scene, filename='mem_graphics_pss.log')[0]
-        targetDic['private_pss'] = self.readLog(scene=scene, filename='mem_private_pss.log')[0]
-        targetDic['system_pss'] = self.readLog(scene=scene, filename='mem_system_pss.log')[0]
-        result = {'status': 1, 'memory_detail': targetDic}
-        return result
+        names = ('java_heap', 'native_heap', 'code_pss', 'stack_pss', 'graphics_pss', 'private_pss', 'system_pss')
+        logs = self._readLogsParallel(scene, [f'mem_{name}.log' for name in names], reader=self.read_log_xy)
+        return {'status': 1, 'memory_detail': {name: logs[f'mem_{name}.log'] for name in names}}
     
     def getCpuCoreLog(self, platform, scene):
-        targetDic = dict()
-        cores =self.readJson(scene=scene).get('cores', 0)
-        if int(cores) > 0:
-            for i in range(int(cores)):
-                targetDic['cpu{}'.format(i)] = self.readLog(scene=scene, filename='cpu{}.log'.format(i))[0]
-        result = {'status': 1, 'cores':cores, 'cpu_core': targetDic}
-        return result
+        cores = self.readJson(scene=scene).get('cores', 0)
+        cpu_core = {f'cpu{i}': self.read_log_xy(scene=scene, filename=f'cpu{i}.log') for i in range(int(cores))}
+        return {'status': 1, 'cores': cores, 'cpu_core': cpu_core}
     
     def getMemLogCompare(self, platform, scene1, scene2):
-        targetDic = dict()
-        targetDic['scene1'] = self.readLog(scene=scene1, filename='mem_total.log')[0]
-        targetDic['scene2'] = self.readLog(scene=scene2, filename='mem_total.log')[0]
-        result = {'status': 1, 'scene1': targetDic['scene1'], 'scene2': targetDic['scene2']}
-        return result
+        return self._compareLog(scene1, scene2, 'mem_total.log')
     
     def getBatteryLog(self, platform, scene):
-        targetDic = dict()
-        if platform == Platform.Android:
-            targetDic['batteryLevel'] = self.readLog(scene=scene, filename='battery_level.log')[0]
-            targetDic['batteryTem'] = self.readLog(scene=scene, filename='battery_tem.log')[0]
-            result = {'status': 1, 
-                      'batteryLevel': targetDic['batteryLevel'], 
-                      'batteryTem': targetDic['batteryTem']}
-        else:
-            targetDic['batteryTem'] = self.readLog(scene=scene, filename='battery_tem.log')[0]
-            targetDic['batteryCurrent'] = self.readLog(scene=scene, filename='battery_current.log')[0]
-            targetDic['batteryVoltage'] = self.readLog(scene=scene, filename='battery_voltage.log')[0]
-            targetDic['batteryPower'] = self.readLog(scene=scene, filename='battery_power.log')[0]    
-        return result
+        series = self._BATTERY_LOGS[Platform.Android if platform == Platform.Android else Platform.iOS]
+        logs = self._readLogsParallel(scene, list(series.values()), reader=self.read_log_xy)
+        return {'status': 1, **{key: logs[filename] for key, filename in series.items()}}
     
     def getBatteryLogCompare(self, platform, scene1, scene2):
-        targetDic = dict()
-        if platform == Platform.Android:
-            targetDic['scene1'] = self.readLog(scene=scene1, filename='battery_level.log')[0]
-            targetDic['scene2'] = self.readLog(scene=scene2, filename='battery_level.log')[0]
-            result = {'status': 1, 'scene1': targetDic['scene1'], 'scene2': targetDic['scene2']}
-        else:
-            targetDic['scene1'] = self.readLog(scene=scene1, filename='batteryPower.log')[0]
-            targetDic['scene2'] = self.readLog(scene=scene2, filename='batteryPower.log')[0]
-            result = {'status': 1, 'scene1': targetDic['scene1'], 'scene2': targetDic['scene2']}    
-        return result
+        filename = 'battery_level.log' if platform == Platform.Android else 'battery_power.log'
+        return self._compareLog(scene1, scene2, filename)
     
     def getFlowLog(self, platform, scene):
-        targetDic = dict()
-        targetDic['upFlow'] = self.readLog(scene=scene, filename='upflow.log')[0]
-        targetDic['downFlow'] = self.readLog(scene=scene, filename='downflow.log')[0]
-        result = {'status': 1, 'upFlow': targetDic['upFlow'], 'downFlow': targetDic['downFlow']}
-        return result
+        return {'status': 1,
+                'upFlow': self.read_log_xy(scene=scene, filename='upflow.log'),
+                'downFlow': self.read_log_xy(scene=scene, filename='downflow.log')}
     
     def getFlowSendLogCompare(self, platform, scene1, scene2):
-        targetDic = dict()
-        targetDic['scene1'] = self.readLog(scene=scene1, filename='upflow.log')[0]
-        targetDic['scene2'] = self.readLog(scene=scene2, filename='upflow.log')[0]
-        result = {'status': 1, 'scene1': targetDic['scene1'], 'scene2': targetDic['scene2']}
-        return result
+        return self._compareLog(scene1, scene2, 'upflow.log')
     
     def getFlowRecvLogCompare(self, platform, scene1, scene2):
-        targetDic = dict()
-        targetDic['scene1'] = self.readLog(scene=scene1, filename='downflow.log')[0]
-        targetDic['scene2'] = self.readLog(scene=scene2, filename='downflow.log')[0]
-        result = {'status': 1, 'scene1': targetDic['scene1'], 'scene2': targetDic['scene2']}
-        return result
+        return self._compareLog(scene1, scene2, 'downflow.log')
     
     def getFpsLog(self, platform, scene):
-        targetDic = dict()
-        targetDic['fps'] = self.readLog(scene=scene, filename='fps.log')[0]
+        result = {'status': 1, 'fps': self.read_log_xy(scene=scene, filename='fps.log')}
         if platform == Platform.Android:
-            targetDic['jank'] = self.readLog(scene=scene, filename='jank.log')[0]
-            result = {'status': 1, 'fps': targetDic['fps'], 'jank': targetDic['jank']}
-        else:
-            result = {'status': 1, 'fps': targetDic['fps']}     
+            result['jank'] = self.read_log_xy(scene=scene, filename='jank.log')
         return result
     
     def getDiskLog(self, platform, scene):
-        targetDic = dict()
-        targetDic['used'] = self.readLog(scene=scene, filename='disk_used.log')[0]
-        targetDic['free'] = self.readLog(scene=scene, filename='disk_free.log')[0]
-        result = {'status': 1, 'used': targetDic['used'], 'free':targetDic['free']}
-        return result
+        return {'status': 1,
+                'used': self.read_log_xy(scene=scene, filename='disk_used.log'),
+                'free': self.read_log_xy(scene=scene, filename='disk_free.log')}
+
+    def _parseDisk(self, scene, filename):
+        """Rows and summed totals of a df snapshot, ([], {}) when it wasn't recorded"""
+        disk_list = list()
+        sum_disk = dict()
+        path = os.path.join(self.report_dir, scene, filename)
+        if os.path.exists(path):
+            rows = [line.split() for line in map(bytes.decode, _iter_lines(path))
+                    if 'Filesystem' not in line and line.strip() != '']
+            for disk_value_list in rows:
+                disk_dict = dict(
+                    filesystem = disk_value_list[0],
+                    blocks = disk_value_list[1],
+                    used = disk_value_list[2],
+                    available = disk_value_list[3],
+                    use_percent = disk_value_list[4],
+                    mounted = disk_value_list[5]
+                )
+                disk_list.append(disk_dict)
+            # blocks/used/available columns summed in one vectorized pass
+            sizes = np.array([row[1:4] for row in rows], dtype=np.int64).reshape(-1, 3).sum(axis=0)
+            sum_disk['sum_size'] = int(sizes[0] // (1024 * 1024))
+            sum_disk['sum_used'] = int(sizes[1] // 1024)
+            sum_disk['sum_free'] = int(sizes[2] // 1024)
+        return disk_list, sum_disk
 
     def analysisDisk(self, scene):
-        initail_disk_list = list()
-        current_disk_list = list()
-        sum_init_disk = dict()
-        sum_current_disk = dict()
-        if os.path.exists(os.path.join(self.report_dir,scene,'initail_disk.log')):
-            size_list = list()
-            used_list = list()
-            free_list = list()
-            lines = self.open_file(os.path.join(self.report_dir,scene,'initail_disk.log'), "r")
-            for line in lines:
-                if 'Filesystem' not in line and line.strip() != '':
-                    disk_value_list = line.split()
-                    disk_dict = dict(
-                        filesystem = disk_value_list[0],
-                        blocks = disk_value_list[1],
-                        used = disk_value_list[2],
-                        available = disk_value_list[3],
-                        use_percent = disk_value_list[4],
-                        mounted = disk_value_list[5]
-                    )
-                    initail_disk_list.append(disk_dict)
-                    size_list.append(int(disk_value_list[1]))
-                    used_list.append(int(disk_value_list[2]))
-                    free_list.append(int(disk_value_list[3]))
-            sum_init_disk['sum_size'] = int(sum(size_list) / 1024 / 1024)
-            sum_init_disk['sum_used'] = int(sum(used_list) / 1024)
-            sum_init_disk['sum_free'] = int(sum(free_list) / 1024)
-               
-        if os.path.exists(os.path.join(self.report_dir,scene,'current_disk.log')):
-            size_list = list()
-            used_list = list()
-            free_list = list()
-            lines = self.open_file(os.path.join(self.report_dir,scene,'current_disk.log'), "r")
-            for line in lines:
-                if 'Filesystem' not in line and line.strip() != '':
-                    disk_value_list = line.split()
-                    disk_dict = dict(
-                        filesystem = disk_value_list[0],
-                        blocks = disk_value_list[1],
-                        used = disk_value_list[2],
-                        available = disk_value_list[3],
-                        use_percent = disk_value_list[4],
-                        mounted = disk_value_list[5]
-                    )
-                    current_disk_list.append(disk_dict)
-                    size_list.append(int(disk_value_list[1]))
-                    used_list.append(int(disk_value_list[2]))
-                    free_list.append(int(disk_value_list[3]))
-            sum_current_disk['sum_size'] = int(sum(size_list) / 1024 / 1024)
-            sum_current_disk['sum_used'] = int(sum(used_list) / 1024)
-            sum_current_disk['sum_free'] = int(sum(free_list) / 1024)       
-                 
+        initail_disk_list, sum_init_disk = self._parseDisk(scene, 'initail_disk.log')
+        current_disk_list, sum_current_disk = self._parseDisk(scene, 'current_disk.log')
         return initail_disk_list, current_disk_list, sum_init_disk, sum_current_disk
 
     def getFpsLogCompare(self, platform, scene1, scene2):
-        targetDic = dict()
-        targetDic['scene1'] = self.readLog(scene=scene1, filename='fps.log')[0]
-        targetDic['scene2'] = self.readLog(scene=scene2, filename='fps.log')[0]
-        result = {'status': 1, 'scene1': targetDic['scene1'], 'scene2': targetDic['scene2']}
-        return result
+        return self._compareLog(scene1, scene2, 'fps.log')
         
     def approximateSize(self, size, a_kilobyte_is_1024_bytes=True):
         '''
@@ -1014,6 +1161,12 @@ class File:
 
         multiple = 1024 if a_kilobyte_is_1024_bytes else 1000
 
+        if multiple == 1024 and isinstance(size, int):
+            # every 10 bits is one binary prefix, always at least KiB
+            exponent = max(1, (size.bit_length() - 1) // 10)
+            if exponent <= len(suffixes[1024]):
+                return '{0:.2f} {1}'.format(size / (1 << (10 * exponent)), suffixes[1024][exponent - 1])
+
         for suffix in suffixes[multiple]:
             size /= multiple
             if size < multiple:
@@ -1022,50 +1175,53 @@ class File:
     def _setAndroidPerfs(self, scene):
         """Aggregate APM data for Android"""
         
-        app = self.readJson(scene=scene).get('app')
-        devices = self.readJson(scene=scene).get('devices')
-        platform = self.readJson(scene=scene).get('platform')
-        ctime = self.readJson(scene=scene).get('ctime')
-
-        cpuAppData = self.readLog(scene=scene, filename=f'cpu_app.log')[1]
-        cpuSystemData = self.readLog(scene=scene, filename=f'cpu_sys.log')[1]
-        if cpuAppData.__len__() > 0 and cpuSystemData.__len__() > 0:
-            cpuAppRate = f'{round(sum(cpuAppData) / len(cpuAppData), 2)}%'
-            cpuSystemRate = f'{round(sum(cpuSystemData) / len(cpuSystemData), 2)}%'
+        scene_dir = os.path.join(self.report_dir, scene)
+        meta = self.readJson(scene=scene)
+        app = meta.get('app')
+        devices = meta.get('devices')
+        platform = meta.get('platform')
+        ctime = meta.get('ctime')
+        logs = self._readLogsParallel(scene, ('cpu_app.log', 'cpu_sys.log', 'battery_level.log',
+                                              'battery_tem.log', 'mem_total.log', 'mem_swap.log', 'fps.log',
+                                              'jank.log', 'gpu.log'))
+
+        cpuAppData = logs['cpu_app.log']
+        cpuSystemData = logs['cpu_sys.log']
+        if cpuAppData.size > 0 and cpuSystemData.size > 0:
+            cpuAppRate = f'{round(float(cpuAppData.mean()), 2)}%'
+            cpuSystemRate = f'{round(float(cpuSystemData.mean()), 2)}%'
         else:
             cpuAppRate, cpuSystemRate = 0, 0    
 
-        batteryLevelData = self.readLog(scene=scene, filename=f'battery_level.log')[1]
-        batteryTemlData = self.readLog(scene=scene, filename=f'battery_tem.log')[1]
-        if batteryLevelData.__len__() > 0 and batteryTemlData.__len__() > 0:
+        batteryLevelData = logs['battery_level.log']
+        batteryTemlData = logs['battery_tem.log']
+        if batteryLevelData.size > 0 and batteryTemlData.size > 0:
             batteryLevel = f'{batteryLevelData[-1]}%'
             batteryTeml = f'{batteryTemlData[-1]}°C'
         else:
             batteryLevel, batteryTeml = 0, 0   
     
 
-        totalPassData = self.readLog(scene=scene, filename=f'mem_total.log')[1]
+        totalPassData = logs['mem_total.log']
         
-        if totalPassData.__len__() > 0:
-            swapPassData = self.readLog(scene=scene, filename=f'mem_swap.log')[1]
-            totalPassAvg = f'{round(sum(totalPassData) / len(totalPassData), 2)}MB'
-            swapPassAvg = f'{round(sum(swapPassData) / len(swapPassData), 2)}MB'
+        if totalPassData.size > 0:
+            swapPassData = logs['mem_swap.log']
+            totalPassAvg = f'{round(float(totalPassData.mean()), 2)}MB'
+            swapPassAvg = f'{round(float(swapPassData.mean()), 2)}MB' if swapPassData.size > 0 else 0
         else:
             totalPassAvg, swapPassAvg = 0, 0    
 
-        fpsData = self.readLog(scene=scene, filename=f'fps.log')[1]
-        jankData = self.readLog(scene=scene, filename=f'jank.log')[1]
-        if fpsData.__len__() > 0:
-            fpsAvg = f'{int(sum(fpsData) / len(fpsData))}HZ/s'
-            jankAvg = f'{int(sum(jankData))}'
+        fpsData = logs['fps.log']
+        jankData = logs['jank.log']
+        if fpsData.size > 0:
+            fpsAvg = f'{int(fpsData.mean())}HZ/s'
+            jankAvg = f'{int(jankData.sum())}'
         else:
             fpsAvg, jankAvg = 0, 0    
 
-        if os.path.exists(os.path.join(self.report_dir,scene,'end_net.json')):
-            f_pre = open(os.path.join(self.report_dir,scene,'pre_net.json'))
-            f_end = open(os.path.join(self.report_dir,scene,'end_net.json'))
-            json_pre = json.loads(f_pre.read())
-            json_end = json.loads(f_end.read())
+        if os.path.exists(os.path.join(scene_dir, 'end_net.json')):
+            json_pre = _load_json(os.path.join(scene_dir, 'pre_net.json'))
+            json_end = _load_json(os.path.join(scene_dir, 'end_net.json'))
             send = json_end['send'] - json_pre['send']
             recv = json_end['recv'] - json_pre['recv']
         else:
@@ -1073,16 +1229,16 @@ class File:
         flowSend = f'{round(float(send / 1024), 2)}MB'
         flowRecv = f'{round(float(recv / 1024), 2)}MB'
 
-        gpuData = self.readLog(scene=scene, filename='gpu.log')[1]
-        if gpuData.__len__() > 0:
-            gpu = round(sum(gpuData) / len(gpuData), 2)
+        gpuData = logs['gpu.log']
+        if gpuData.size > 0:
+            gpu = round(float(gpuData.mean()), 2)
         else:
             gpu = 0
 
-        mem_detail_flag = os.path.exists(os.path.join(self.report_dir,scene,'mem_java_heap.log'))
-        disk_flag = os.path.exists(os.path.join(self.report_dir,scene,'disk_free.log'))
-        thermal_flag = os.path.exists(os.path.join(self.report_dir,scene,'init_thermal_temp.json'))
-        cpu_core_flag = os.path.exists(os.path.join(self.report_dir,scene,'cpu0.log'))
+        mem_detail_flag = os.path.exists(os.path.join(scene_dir, 'mem_java_heap.log'))
+        disk_flag = os.path.exists(os.path.join(scene_dir, 'disk_free.log'))
+        thermal_flag = os.path.exists(os.path.join(scene_dir, 'init_thermal_temp.json'))
+        cpu_core_flag = os.path.exists(os.path.join(scene_dir, 'cpu0.log'))
         apm_dict = dict()
         apm_dict['app'] = app
         apm_dict['devices'] = devices
@@ -1105,8 +1261,8 @@ class File:
         apm_dict['cpu_core_flag'] = cpu_core_flag
         
         if thermal_flag:
-            init_thermal_temp = json.loads(open(os.path.join(self.report_dir,scene,'init_thermal_temp.json')).read())
-            current_thermal_temp = json.loads(open(os.path.join(self.report_dir,scene,'current_thermal_temp.json')).read())
+            init_thermal_temp = _load_json(os.path.join(scene_dir, 'init_thermal_temp.json'))
+            current_thermal_temp = _load_json(os.path.join(scene_dir, 'current_thermal_temp.json'))
             apm_dict['init_thermal_temp'] = init_thermal_temp
             apm_dict['current_thermal_temp'] = current_thermal_temp
 
@@ -1115,57 +1271,62 @@ class File:
     def _setiOSPerfs(self, scene):
         """Aggregate APM data for iOS"""
         
-        app = self.readJson(scene=scene).get('app')
-        devices = self.readJson(scene=scene).get('devices')
-        platform = self.readJson(scene=scene).get('platform')
-        ctime = self.readJson(scene=scene).get('ctime')
-
-        cpuAppData = self.readLog(scene=scene, filename=f'cpu_app.log')[1]
-        cpuSystemData = self.readLog(scene=scene, filename=f'cpu_sys.log')[1]
-        if cpuAppData.__len__() > 0 and cpuSystemData.__len__() > 0:
-            cpuAppRate = f'{round(sum(cpuAppData) / len(cpuAppData), 2)}%'
-            cpuSystemRate = f'{round(sum(cpuSystemData) / len(cpuSystemData), 2)}%'
+        meta = self.readJson(scene=scene)
+        app = meta.get('app')
+        devices = meta.get('devices')
+        platform = meta.get('platform')
+        ctime = meta.get('ctime')
+        logs = self._readLogsParallel(scene, ('cpu_app.log', 'cpu_sys.log', 'mem_total.log', 'fps.log',
+                                              'upflow.log', 'downflow.log', 'battery_tem.log',
+                                              'battery_current.log', 'battery_voltage.log',
+                                              'battery_power.log', 'gpu.log'))
+
+        cpuAppData = logs['cpu_app.log']
+        cpuSystemData = logs['cpu_sys.log']
+        if cpuAppData.size > 0 and cpuSystemData.size > 0:
+            cpuAppRate = f'{round(float(cpuAppData.mean()), 2)}%'
+            cpuSystemRate = f'{round(float(cpuSystemData.mean()), 2)}%'
         else:
             cpuAppRate, cpuSystemRate = 0, 0
 
-        totalPassData = self.readLog(scene=scene, filename='mem_total.log')[1]
-        if totalPassData.__len__() > 0:
-            totalPassAvg = f'{round(sum(totalPassData) / len(totalPassData), 2)}MB'
+        totalPassData = logs['mem_total.log']
+        if totalPassData.size > 0:
+            totalPassAvg = f'{round(float(totalPassData.mean()), 2)}MB'
         else:
             totalPassAvg = 0
 
-        fpsData = self.readLog(scene=scene, filename='fps.log')[1]
-        if fpsData.__len__() > 0:
-            fpsAvg = f'{int(sum(fpsData) / len(fpsData))}HZ/s'
+        fpsData = logs['fps.log']
+        if fpsData.size > 0:
+            fpsAvg = f'{int(fpsData.mean())}HZ/s'
         else:
             fpsAvg = 0
 
-        flowSendData = self.readLog(scene=scene, filename='upflow.log')[1]
-        flowRecvData = self.readLog(scene=scene, filename='downflow.log')[1]
-        if flowSendData.__len__() > 0:
-            flowSend = f'{round(float(sum(flowSendData) / 1024), 2)}MB'
-            flowRecv = f'{round(float(sum(flowRecvData) / 1024), 2)}MB'
+        flowSendData = logs['upflow.log']
+        flowRecvData = logs['downflow.log']
+        if flowSendData.size > 0:
+            flowSend = f'{round(float(flowSendData.sum()) / 1024, 2)}MB'
+            flowRecv = f'{round(float(flowRecvData.sum()) / 1024, 2)}MB'
         else:
             flowSend, flowRecv = 0, 0    
 
-        batteryTemlData = self.readLog(scene=scene, filename='battery_tem.log')[1]
-        batteryCurrentData = self.readLog(scene=scene, filename='battery_current.log')[1]
-        batteryVoltageData = self.readLog(scene=scene, filename='battery_voltage.log')[1]
-        batteryPowerData = self.readLog(scene=scene, filename='battery_power.log')[1]
-        if batteryTemlData.__len__() > 0:
+        batteryTemlData = logs['battery_tem.log']
+        batteryCurrentData = logs['battery_current.log']
+        batteryVoltageData = logs['battery_voltage.log']
+        batteryPowerData = logs['battery_power.log']
+        if batteryTemlData.size > 0:
             batteryTeml = int(batteryTemlData[-1])
-            batteryCurrent = int(sum(batteryCurrentData) / len(batteryCurrentData))
-            batteryVoltage = int(sum(batteryVoltageData) / len(batteryVoltageData))
-            batteryPower = int(sum(batteryPowerData) / len(batteryPowerData))
+            batteryCurrent = int(batteryCurrentData.mean()) if batteryCurrentData.size > 0 else 0
+            batteryVoltage = int(batteryVoltageData.mean()) if batteryVoltageData.size > 0 else 0
+            batteryPower = int(batteryPowerData.mean()) if batteryPowerData.size > 0 else 0
         else:
             batteryTeml,  batteryCurrent , batteryVoltage, batteryPower = 0, 0, 0, 0 
 
-        gpuData = self.readLog(scene=scene, filename='gpu.log')[1]
-        if gpuData.__len__() > 0:
-            gpu = round(sum(gpuData) / len(gpuData), 2)
+        gpuData = logs['gpu.log']
+        if gpuData.size > 0:
+            gpu = round(float(gpuData.mean()), 2)
         else:
             gpu = 0    
-        disk_flag = os.path.exists(os.path.join(self.report_dir,scene,'disk_free.log'))
+        disk_flag = os.path.exists(os.path.join(self.report_dir, scene, 'disk_free.log'))
         apm_dict = dict()
         apm_dict['app'] = app
         apm_dict['devices'] = devices
@@ -1190,25 +1351,27 @@ class File:
 
     def _setpkPerfs(self, scene):
         """Aggregate APM data for pk model"""
-        cpuAppData1 = self.readLog(scene=scene, filename='cpu_app1.log')[1]
-        cpuAppRate1 = f'{round(sum(cpuAppData1) / len(cpuAppData1), 2)}%'
-        cpuAppData2 = self.readLog(scene=scene, filename='cpu_app2.log')[1]
-        cpuAppRate2 = f'{round(sum(cpuAppData2) / len(cpuAppData2), 2)}%'
-
-        totalPassData1 = self.readLog(scene=scene, filename='mem1.log')[1]
-        totalPassAvg1 = f'{round(sum(totalPassData1) / len(totalPassData1), 2)}MB'
-        totalPassData2 = self.readLog(scene=scene, filename='mem2.log')[1]
-        totalPassAvg2 = f'{round(sum(totalPassData2) / len(totalPassData2), 2)}MB'
-
-        fpsData1 = self.readLog(scene=scene, filename='fps1.log')[1]
-        fpsAvg1 = f'{int(sum(fpsData1) / len(fpsData1))}HZ/s'
-        fpsData2 = self.readLog(scene=scene, filename='fps2.log')[1]
-        fpsAvg2 = f'{int(sum(fpsData2) / len(fpsData2))}HZ/s'
-
-        networkData1 = self.readLog(scene=scene, filename='network1.log')[1]
-        network1 = f'{round(float(sum(networkData1) / 1024), 2)}MB'
-        networkData2 = self.readLog(scene=scene, filename='network2.log')[1]
-        network2 = f'{round(float(sum(networkData2) / 1024), 2)}MB'
+        logs = self._readLogsParallel(scene, ('cpu_app1.log', 'cpu_app2.log', 'mem1.log', 'mem2.log',
+                                              'fps1.log', 'fps2.log', 'network1.log', 'network2.log'))
+        cpuAppData1 = logs['cpu_app1.log']
+        cpuAppRate1 = f'{round(float(cpuAppData1.mean()), 2)}%' if cpuAppData1.size else 0
+        cpuAppData2 = logs['cpu_app2.log']
+        cpuAppRate2 = f'{round(float(cpuAppData2.mean()), 2)}%' if cpuAppData2.size else 0
+
+        totalPassData1 = logs['mem1.log']
+        totalPassAvg1 = f'{round(float(totalPassData1.mean()), 2)}MB' if totalPassData1.size else 0
+        totalPassData2 = logs['mem2.log']
+        totalPassAvg2 = f'{round(float(totalPassData2.mean()), 2)}MB' if totalPassData2.size else 0
+
+        fpsData1 = logs['fps1.log']
+        fpsAvg1 = f'{int(fpsData1.mean())}HZ/s' if fpsData1.size else 0
+        fpsData2 = logs['fps2.log']
+        fpsAvg2 = f'{int(fpsData2.mean())}HZ/s' if fpsData2.size else 0
+
+        networkData1 = logs['network1.log']
+        network1 = f'{round(float(networkData1.sum()) / 1024, 2)}MB'
+        networkData2 = logs['network2.log']
+        network2 = f'{round(float(networkData2.sum()) / 1024, 2)}MB'
         
         apm_dict = dict()
         apm_dict['cpuAppRate1'] = cpuAppRate1
@@ -59,6 +59,7 @@ def initialize():
     """initialize apm env"""
     try:
         f.clear_file()
+        d.invalidate()
         result = {'status': 1, 'msg': 'initialize env success'}
     except Exception as e:
         logger.exception(e)
@@ -623,11 +624,12 @@ def exportAndroidHtml():
     net_recv = method._request(request, 'net_recv')
     gpu = method._request(request, 'gpu')
     try:
+        meta = f.readJson(scene)
         summary_dict = dict()
-        summary_dict['app'] = f.readJson(scene).get('app')
-        summary_dict['platform'] = f.readJson(scene).get('platform')
-        summary_dict['devices'] = f.readJson(scene).get('devices')
-        summary_dict['ctime'] = f.readJson(scene).get('ctime')
+        summary_dict['app'] = meta.get('app')
+        summary_dict['platform'] = meta.get('platform')
+        summary_dict['devices'] = meta.get('devices')
+        summary_dict['ctime'] = meta.get('ctime')
         summary_dict['cpu_app'] = cpu_app
         summary_dict['cpu_sys'] = cpu_sys
         summary_dict['mem_total'] = mem_total
@@ -669,11 +671,12 @@ def exportiOSHtml():
     net_send = method._request(request, 'net_send')
     net_recv = method._request(request, 'net_recv')
     try:
+        meta = f.readJson(scene)
         summary_dict = dict()
-        summary_dict['app'] = f.readJson(scene).get('app')
-        summary_dict['platform'] = f.readJson(scene).get('platform')
-        summary_dict['devices'] = f.readJson(scene).get('devices')
-        summary_dict['ctime'] = f.readJson(scene).get('ctime')
+        summary_dict['app'] = meta.get('app')
+        summary_dict['platform'] = meta.get('platform')
+        summary_dict['devices'] = meta.get('devices')
+        summary_dict['ctime'] = meta.get('ctime')
         summary_dict['cpu_app'] = cpu_app
         summary_dict['cpu_sys'] = cpu_sys
         summary_dict['mem_total'] = mem_total
@@ -759,8 +762,8 @@ def getpkLogData():
     target1 = method._request(request, 'target1')
     target2 = method._request(request, 'target2')
     try:
-        first = f.readLog(scene=scene, filename=f'{target1}.log')[0]
-        second = f.readLog(scene=scene, filename=f'{target2}.log')[0]
+        first = f.read_log_xy(scene=scene, filename=f'{target1}.log')
+        second = f.read_log_xy(scene=scene, filename=f'{target2}.log')
         result = {'status': 1, 'first': first, 'second': second}
     except Exception as e:
         logger.exception(e)
@@ -1,83 +1,179 @@
 import json
 import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from operator import itemgetter
 from flask import Blueprint
-from flask import render_template
+from flask import current_app
+from flask import g
 from flask import request
 from logzero import logger
-from solox.public.common import Devices,File,Method
+from solox.public.common import File,Method,SESSION_FILE_EXTS,read_json_cached
 
 page = Blueprint("page", __name__)
-d = Devices()
-m = Method()
-f = File()
+# Platforms a scene comparison can be rendered for
+_SUPPORTED_PLATFORMS = frozenset(('Android', 'iOS'))
+# result.json fields a report needs to be listed
+_REPORT_FIELDS = ('app', 'platform', 'model', 'devices', 'ctime')
+_required_fields = itemgetter(*_REPORT_FIELDS)
+# report() summaries per report dir: (dir mtime, built at, page, per_page, summaries, total)
+_REPORT_CACHE_TTL = 10
+_report_cache = {}
+# reports listed per page of /report unless ?per_page= asks otherwise
+_REPORTS_PER_PAGE = 50
+# sorted scene dirs per report dir: (dir mtime, entries)
+_entries_cache = {}
+
+@lru_cache(maxsize=16)
+def _template(jinja_env, name):
+    """Template object for a page, looked up in the loader once per app"""
+    return jinja_env.get_template(name)
+
+def _render(template_name, /, **context):
+    """render_template over the resolved template, still with Flask's context processors applied"""
+    app = current_app._get_current_object()
+    app.update_template_context(context)
+    return _template(app.jinja_env, template_name).render(context)
+
+# Built on first use rather than at import, File() resolves and creates the report dir
+@lru_cache(maxsize=None)
+def _m():
+    return Method()
+
+@lru_cache(maxsize=None)
+def _f():
+    return File()
+
+@lru_cache(maxsize=None)
+def _report_dir():
+    """Report root under the directory solox was started from, nothing in the app changes cwd"""
+    return os.path.join(os.getcwd(), 'report')
+
+def _settings():
+    """Page settings for the current request, computed once even if a view and an error handler both ask"""
+    if '_solox_settings' not in g:
+        g._solox_settings = _m()._settings(request)
+    return g._solox_settings
 
 @page.app_errorhandler(404)
 def page_404(e):
-    settings = m._settings(request)
-    return render_template('404.html', **locals()), 404
+    settings = _settings()
+    return _render('404.html', settings=settings), 404
 
 @page.app_errorhandler(500)
 def page_500(e):
-    settings = m._settings(request)
-    return render_template('500.html', **locals()), 500
+    settings = _settings()
+    return _render('500.html', settings=settings), 500
 
 @page.route('/')
 def index():
     platform = request.args.get('platform')
     lan = request.args.get('lan')
-    settings = m._settings(request)
-    return render_template('index.html', **locals())
+    settings = _settings()
+    return _render('index.html', platform=platform, lan=lan, settings=settings)
 
 @page.route('/pk')
 def pk():
     lan = request.args.get('lan')
     model = request.args.get('model')
-    settings = m._settings(request)
-    return render_template('pk.html', **locals())
+    settings = _settings()
+    return _render('pk.html', lan=lan, model=model, settings=settings)
+
+def _is_scene(report_dir, scene):
+    """True if scene names a report folder, rejecting names that would reach outside report_dir"""
+    if not scene or scene in ('.', '..') or os.sep in scene or (os.altsep and os.altsep in scene):
+        return False
+    return os.path.isdir(os.path.join(report_dir, scene))
+
+def _load_report(entry):
+    """Summary of one report dir for the list page, None if its result.json is missing or incomplete"""
+    dir = entry.name
+    path = os.path.join(entry.path, 'result.json')
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        # a scene still being recorded has no result.json yet, that's not worth a log line per page view
+        return None
+    try:
+        json_data = read_json_cached(path, st)
+        dict_data = {key: json_data.get(key) for key in _REPORT_FIELDS}
+        dict_data['scene'] = dir
+        dict_data['video'] = json_data.get('video', 0)
+        # Validate required fields
+        if not all(_required_fields(dict_data)):
+            logger.warning(f"Missing required fields in report file {dir}")
+            return None
+        return dict_data
+    except (FileNotFoundError, json.JSONDecodeError) as e:
+        logger.error(f"Error reading report file {dir}: {str(e)}")
+    except Exception as e:
+        logger.exception("Unexpected error processing report file %s: %s", dir, e)
+    return None
+
+def _scene_entries(report_dir, dir_mtime):
+    """Scene dirs of report_dir newest first, rescanned only when the dir's mtime moves"""
+    cached = _entries_cache.get(report_dir)
+    if cached and cached[0] == dir_mtime:
+        return cached[1]
+    # one scandir pass, the DirEntry answers is_dir() and stat() from what it already holds
+    with os.scandir(report_dir) as it:
+        entries = [(entry.stat(follow_symlinks=False).st_mtime, entry) for entry in it
+                   if entry.name.rpartition('.')[2] not in SESSION_FILE_EXTS and entry.is_dir()]
+    entries.sort(key=itemgetter(0), reverse=True)
+    entries = [entry for _, entry in entries]
+    _entries_cache[report_dir] = (dir_mtime, entries)
+    return entries
+
+def _other_scenes(report_dir, scene):
+    """Names of the scenes analysis() can compare against, newest first, from the cached dir scan"""
+    try:
+        entries = _scene_entries(report_dir, os.stat(report_dir).st_mtime_ns)
+    except OSError as e:
+        logger.error(f"Error accessing report directory: {str(e)}")
+        return []
+    return [entry.name for entry in entries if entry.name != scene]
+
+def _report_summaries(report_dir, page, per_page):
+    """Summaries of one page of reports under report_dir, newest first, and the number of scenes
+
+    Only the scenes on the requested page have their result.json loaded. The page is
+    reused for _REPORT_CACHE_TTL seconds so polling clients don't rescan the dir,
+    and dropped as soon as a report is added or removed (the dir's mtime moves).
+    """
+    dir_mtime = os.stat(report_dir).st_mtime_ns
+    now = time.monotonic()
+    cached = _report_cache.get(report_dir)
+    if cached and cached[0] == dir_mtime and now - cached[1] < _REPORT_CACHE_TTL and cached[2:4] == (page, per_page):
+        return cached[4], cached[5]
+    entries = _scene_entries(report_dir, dir_mtime)
+    page_entries = entries[(page - 1) * per_page:page * per_page]
+    if page_entries:
+        # the per-scene reads are independent and wait on disk, overlap them
+        with ThreadPoolExecutor(max_workers=min(32, len(page_entries))) as executor:
+            apm_data = [data for data in executor.map(_load_report, page_entries) if data]
+    else:
+        apm_data = []
+    _report_cache[report_dir] = (dir_mtime, now, page, per_page, apm_data, len(entries))
+    return apm_data, len(entries)
 
 @page.route('/report')
 def report():
     lan = request.args.get('lan')
-    settings = m._settings(request)
-    report_dir = os.path.join(os.getcwd(), 'report')
+    page = max(request.args.get('page', 1, type=int), 1)
+    per_page = max(request.args.get('per_page', _REPORTS_PER_PAGE, type=int), 1)
+    settings = _settings()
+    report_dir = _report_dir()
     try:
         if not os.path.exists(report_dir):
             os.makedirs(report_dir)
-        dirs = os.listdir(report_dir)
-        dir_list = reversed(sorted(dirs, key=lambda x: os.path.getmtime(os.path.join(report_dir, x))))
-        apm_data = []
-        for dir in dir_list:
-            if dir.split(".")[-1] not in ['log', 'json', 'mkv']:
-                try:
-                    with open(os.path.join(report_dir, dir, 'result.json'), 'r') as fpath:
-                        json_data = json.loads(fpath.read())
-                        dict_data = {
-                            'scene': dir,
-                            'app': json_data.get('app'),
-                            'platform': json_data.get('platform'),
-                            'model': json_data.get('model'),
-                            'devices': json_data.get('devices'),
-                            'ctime': json_data.get('ctime'),
-                            'video': json_data.get('video', 0)
-                        }
-                        # Validate required fields
-                        if not all(dict_data[key] for key in ['app', 'platform', 'model', 'devices', 'ctime']):
-                            logger.warning(f"Missing required fields in report file {dir}")
-                            continue
-                        apm_data.append(dict_data)
-                except (FileNotFoundError, json.JSONDecodeError) as e:
-                    logger.error(f"Error reading report file {dir}: {str(e)}")
-                    continue
-                except Exception as e:
-                    logger.error(f"Unexpected error processing report file {dir}: {str(e)}")
-                    logger.exception(e)
-                    continue
+        apm_data, total = _report_summaries(report_dir, page, per_page)
     except Exception as e:
-        logger.error(f"Error accessing report directory: {str(e)}")
-        logger.exception(e)
-        apm_data = []
+        logger.exception("Error accessing report directory: %s", e)
+        apm_data, total = [], 0
     apm_data_len = len(apm_data)
-    return render_template('report.html', **locals())
+    return _render('report.html', lan=lan, settings=settings, apm_data=apm_data, apm_data_len=apm_data_len,
+                   page=page, per_page=per_page, has_next=page * per_page < total)
 
 @page.route('/analysis', methods=['post', 'get'])
 def analysis():
@@ -85,30 +181,24 @@ def analysis():
     scene = request.args.get('scene')
     app = request.args.get('app')
     platform = request.args.get('platform')
-    settings = m._settings(request)
-    report_dir = os.path.join(os.getcwd(), 'report')
-    dirs = os.listdir(report_dir)
-    filter_dir = f.filter_secen(scene)
+    settings = _settings()
+    report_dir = _report_dir()
+    filter_dir = _other_scenes(report_dir, scene)
     apm_data = {}
-    for dir in dirs:
-        if dir == scene:
-            try:
-                if platform == 'Android':
-                    apm_data = f._setAndroidPerfs(scene)
-                    disk = f.analysisDisk(scene)
-                    initial_disk  = disk[0]
-                    current_disk  = disk[1]
-                    sum_init_disk = disk[2]
-                    sum_current_disk = disk[3]
-                else:
-                    apm_data = f._setiOSPerfs(scene)
-            except ZeroDivisionError:
-                pass    
-            except Exception as e:
-                logger.exception(e)
-            finally:
-                break
-    return render_template('analysis.html', **locals())
+    initial_disk, current_disk, sum_init_disk, sum_current_disk = [], [], {}, {}
+    if _is_scene(report_dir, scene):
+        # empty series aggregate to 0 in _set*Perfs, an exception here is a real failure
+        try:
+            if platform == 'Android':
+                apm_data = _f()._setAndroidPerfs(scene)
+                initial_disk, current_disk, sum_init_disk, sum_current_disk = _f().analysisDisk(scene)
+            else:
+                apm_data = _f()._setiOSPerfs(scene)
+        except Exception as e:
+            logger.exception("Error processing performance data for scene %s: %s", scene, e)
+    return _render('analysis.html', lan=lan, scene=scene, app=app, platform=platform, settings=settings,
+                   filter_dir=filter_dir, apm_data=apm_data, initial_disk=initial_disk, current_disk=current_disk,
+                   sum_init_disk=sum_init_disk, sum_current_disk=sum_current_disk)
 
 @page.route('/pk_analysis', methods=['post', 'get'])
 def analysis_pk():
@@ -117,27 +207,23 @@ def analysis_pk():
     scene = request.args.get('scene')
     app = request.args.get('app')
     model = request.args.get('model')
-    settings = m._settings(request)
+    settings = _settings()
+    apm_data = {}
     
     try:
-        report_dir = os.path.join(os.getcwd(), 'report')
+        report_dir = _report_dir()
         if not os.path.exists(report_dir):
             raise FileNotFoundError("Report directory does not exist")
             
-        dirs = os.listdir(report_dir)
-        apm_data = {}
-        
-        if scene in dirs:
+        if _is_scene(report_dir, scene):
             try:
-                apm_data = f._setpkPerfs(scene)
+                apm_data = _f()._setpkPerfs(scene)
             except Exception as e:
-                logger.error(f"Error processing performance data for scene {scene}: {str(e)}")
-                logger.exception(e)
+                logger.exception("Error processing performance data for scene %s: %s", scene, e)
     except Exception as e:
-        logger.error(f"Error accessing report data: {str(e)}")
-        logger.exception(e)
+        logger.exception("Error accessing report data: %s", e)
         
-    return render_template('analysis_pk.html', **locals())
+    return _render('analysis_pk.html', lan=lan, scene=scene, app=app, model=model, settings=settings, apm_data=apm_data)
 
 @page.route('/compare_analysis', methods=['post', 'get'])
 def analysis_compare():
@@ -147,35 +233,34 @@ def analysis_compare():
     scene1 = request.args.get('scene1')
     scene2 = request.args.get('scene2')
     app = request.args.get('app')
-    settings = m._settings(request)
+    settings = _settings()
     
     try:
-        if not all([platform, scene1, scene2]):
+        if not (platform and scene1 and scene2):
             raise ValueError("Missing required parameters: platform, scene1, or scene2")
             
-        if platform not in ['Android', 'iOS']:
+        if platform not in _SUPPORTED_PLATFORMS:
             raise ValueError(f"Unsupported platform: {platform}")
             
         try:
-            if platform == 'Android':
-                apm_data1 = f._setAndroidPerfs(scene1)
-                apm_data2 = f._setAndroidPerfs(scene2)
-            else:  # iOS
-                apm_data1 = f._setiOSPerfs(scene1)
-                apm_data2 = f._setiOSPerfs(scene2)
+            load = _f()._setAndroidPerfs if platform == 'Android' else _f()._setiOSPerfs
+            # the two scenes are independent, load them side by side
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                future1 = executor.submit(load, scene1)
+                future2 = executor.submit(load, scene2)
+                apm_data1, apm_data2 = future1.result(), future2.result()
         except ZeroDivisionError as e:
             logger.warning(f"Division by zero error in performance data: {str(e)}")
             apm_data1 = None
             apm_data2 = None
         except Exception as e:
-            logger.error(f"Error processing performance data: {str(e)}")
-            logger.exception(e)
+            logger.exception("Error processing performance data: %s", e)
             apm_data1 = None
             apm_data2 = None
     except Exception as e:
-        logger.error(f"Error in comparison analysis: {str(e)}")
-        logger.exception(e)
+        logger.exception("Error in comparison analysis: %s", e)
         apm_data1 = None
         apm_data2 = None
         
-    return render_template('analysis_compare.html', **locals())
+    return _render('analysis_compare.html', platform=platform, lan=lan, scene1=scene1, scene2=scene2, app=app,
+                   settings=settings, apm_data1=apm_data1, apm_data2=apm_data2)
@@ -20,6 +20,8 @@ from solox.view.pages import page
 from solox import __version__
 
 app = Flask(__name__, template_folder='templates', static_folder='static')
+# templates ship with the package, don't stat them for changes on every render
+app.config['TEMPLATES_AUTO_RELOAD'] = False
 app.register_blueprint(api)
 app.register_blueprint(page)
 
@@ -0,0 +1,19 @@
+import pytest
+
+
+def pytest_addoption(parser):
+    parser.addoption("--run-hardware", action="store_true", default=False,
+                     help="run tests that need adb/usbmuxd and the devices behind them")
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "hardware: needs a working adb/usbmuxd on the host, skipped unless --run-hardware")
+
+
+def pytest_collection_modifyitems(config, items):
+    if config.getoption("--run-hardware"):
+        return
+    skip_hardware = pytest.mark.skip(reason="needs --run-hardware")
+    for item in items:
+        if "hardware" in item.keywords:
+            item.add_marker(skip_hardware)
@@ -146,8 +146,7 @@ async def test_health_history(device_pool):
     assert len(monitor.health_history["device1"]) == 5
     
     # Test history limit
-    for _ in range(200):
-        await monitor.check_device_health("device1")
+    await asyncio.gather(*(monitor.check_device_health("device1") for _ in range(200)))
     
     assert len(monitor.health_history["device1"]) == 100
 
@@ -164,8 +163,8 @@ async def test_metrics_history(device_pool):
     assert len(profiler.metrics_history["device1"]) == 5
     
     # Test history limit
-    for _ in range(2000):
-        metrics = await profiler._collect_metrics("device1")
+    batch = await asyncio.gather(*(profiler._collect_metrics("device1") for _ in range(2000)))
+    for metrics in batch:
         profiler._update_metrics_history("device1", metrics)
     
     assert len(profiler.metrics_history["device1"]) == 1000 
\ No newline at end of file
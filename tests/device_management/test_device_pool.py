@@ -2,10 +2,11 @@
 Unit tests for the DevicePool class
 """
 
+import asyncio
 import time
 import unittest
 from unittest.mock import Mock, patch
-from solox.device_management.device_pool import DevicePool, DeviceType, DeviceInfo
+from solox.device_management.device_pool import AsyncDevicePool, DevicePool, DeviceType, DeviceInfo
 
 class TestDevicePool(unittest.TestCase):
     def setUp(self):
@@ -140,5 +141,63 @@ class TestDevicePool(unittest.TestCase):
         result = self.pool.wait_for_device(self.android_device['id'], timeout=1)
         self.assertTrue(result)
 
+    def test_change_notification(self):
+        """Test waiting for device state changes"""
+        self.pool.add_device('android123', DeviceType.ANDROID, 'Test Android', '12.0')
+        
+        # No transitions yet, the wait should time out empty
+        self.assertEqual(self.pool.wait_for_changes(timeout=0.1), set())
+        
+        # A status transition wakes up the waiter
+        self.pool._update_device_status('android123', "connected", time.time())
+        self.assertEqual(self.pool.wait_for_changes(timeout=1), {'android123'})
+        
+        # Changes are consumed by the previous wait
+        self.assertEqual(self.pool.wait_for_changes(timeout=0.1), set())
+
+    def test_snapshot(self):
+        """Test device snapshots are reused until the topology changes"""
+        self.pool.add_device('android123', DeviceType.ANDROID, 'Test Android', '12.0')
+        
+        snapshot = self.pool.snapshot(['android123', 'ios456'])
+        self.assertEqual(snapshot['android123'].name, 'Test Android')
+        self.assertIsNone(snapshot['ios456'])
+        self.assertIs(self.pool.snapshot(['android123', 'ios456']), snapshot)
+        
+        # Adding a device invalidates the cached snapshot
+        self.pool.add_device('ios456', DeviceType.IOS, 'Test iPhone', '15.0')
+        snapshot = self.pool.snapshot(['android123', 'ios456'])
+        self.assertEqual(snapshot['ios456'].name, 'Test iPhone')
+
+    def test_subscribe(self):
+        """Test subscribers are notified of status changes"""
+        self.pool.add_device('android123', DeviceType.ANDROID, 'Test Android', '12.0')
+        events = []
+        callback = lambda device, status: events.append((device.id, status))
+        self.pool.subscribe(callback)
+        
+        # Events are delivered once the write lock is released
+        self.pool._apply_device_event('android123', DeviceType.ANDROID, True)
+        self.assertEqual(events, [('android123', 'connected')])
+        
+        # Unchanged status doesn't notify, and unsubscribed callbacks stop receiving events
+        self.pool._apply_device_event('android123', DeviceType.ANDROID, True)
+        self.pool.unsubscribe(callback)
+        self.pool.remove_device('android123')
+        self.assertEqual(events, [('android123', 'connected')])
+
+    def test_async_wait_for_device(self):
+        """Test waiting for a device from an event loop"""
+        pool = AsyncDevicePool()
+        pool.add_device('android123', DeviceType.ANDROID, 'Test Android', '12.0')
+        
+        async def scenario():
+            self.assertFalse(await pool.wait_for_device('android123', timeout=0.1))
+            waiters = asyncio.gather(*[pool.wait_for_device('android123', timeout=1) for _ in range(10)])
+            await asyncio.to_thread(pool._apply_device_event, 'android123', DeviceType.ANDROID, True)
+            return await waiters
+        
+        self.assertTrue(all(asyncio.run(scenario())))
+
 if __name__ == '__main__':
     unittest.main() 
\ No newline at end of file
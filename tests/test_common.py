@@ -1,12 +1,55 @@
 import pytest
 import os
 import json
+import copy
+import threading
+import types
 from solox.public.common import Devices, File, Method, Platform
-from unittest.mock import patch
+from unittest.mock import MagicMock
 
-def test_devices_check():
-    devices = Devices()
-    
+# Devices() and File() are built once per session and shallow-copied into each test
+@pytest.fixture(scope="session")
+def _devices_template():
+    return Devices()
+
+def _fresh_copy(template):
+    """Copy of a Devices with its own caches and sessions, so nothing a test caches reaches the next"""
+    devices = copy.copy(template)
+    devices._static_props = {}
+    devices._sessions = {}
+    devices._sessions_lock = threading.Lock()
+    devices._ios_devices = {}
+    devices._ios_info = {}
+    devices._ios_apps = {}
+    devices.invalidate()
+    return devices
+
+@pytest.fixture
+def devices(_devices_template):
+    devices = _fresh_copy(_devices_template)
+    yield devices
+    devices.close_sessions()
+
+@pytest.fixture(scope="session")
+def _file_template():
+    return File()
+
+@pytest.fixture
+def file(_file_template):
+    # File's instance state is just its paths, the log handles and net baseline are class-level anyway
+    return copy.copy(_file_template)
+
+@pytest.fixture(scope="module")
+def patched_device():
+    """tidevice Device stub whose device_info is unusable, patched in once for the module"""
+    fake = MagicMock()
+    fake.return_value.device_info = None
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr('solox.public.common.Device', fake)
+        yield fake
+
+@pytest.mark.hardware
+def test_devices_check(devices):
     # Test Android platform
     with pytest.raises(Exception, match='no devices found'):
         devices.devicesCheck(Platform.Android)
@@ -14,62 +57,44 @@ def test_devices_check():
     # Test iOS platform
     with pytest.raises(Exception, match='no devices found'):
         devices.devicesCheck(Platform.iOS)
-        
-    # Test unsupported platform
-    with pytest.raises(ValueError, match='Unsupported platform'):
-        devices.devicesCheck('Windows')
 
-def test_get_device_detail():
-    devices = Devices()
-    
+def test_get_device_detail(devices, patched_device):
     # Test Android platform
-    with pytest.raises(Exception):
+    with pytest.raises(Exception, match='Device not found'):
         devices.getDdeviceDetail('invalid_id', Platform.Android)
     
     # Test iOS platform
-    with patch('solox.public.common.Device') as mock_device:
-        mock_device.return_value.device_info = None
-        with pytest.raises(Exception):
-            devices.getDdeviceDetail('invalid_id', Platform.iOS)
-    
-    # Test unsupported platform
+    with pytest.raises(Exception, match='Device not found'):
+        devices.getDdeviceDetail('invalid_id', Platform.iOS)
+
+@pytest.mark.parametrize("method,args", [
+    (Devices.devicesCheck, ('Windows',)),
+    (Devices.getDdeviceDetail, ('invalid_id', 'Windows')),
+])
+def test_unsupported_platform(devices, method, args):
     with pytest.raises(ValueError, match='Unsupported platform'):
-        devices.getDdeviceDetail('invalid_id', 'Windows')
+        method(devices, *args)
 
-def test_record_net():
-    file = File()
-    
-    # Test 'pre' type
-    result = file.record_net('pre', 100, 200)
-    assert isinstance(result, dict)
-    assert result['send'] == 100
-    assert result['recv'] == 200
-    
-    # Test 'next' type
-    result = file.record_net('next', 300, 400)
-    assert isinstance(result, dict)
-    assert result['send'] == 200  # 300 - 100
-    assert result['recv'] == 200  # 400 - 200
-    
-    # Test invalid type
+@pytest.mark.parametrize("p_s,p_r,n_s,n_r,e_s,e_r", [
+    (100, 200, 300, 400, 200, 200),
+    (1000, 2000, 3000, 4000, 2000, 2000),
+])
+def test_record_net(file, p_s, p_r, n_s, n_r, e_s, e_r):
+    # 'pre' records the baseline, 'next' returns the delta against it
+    assert file.record_net('pre', p_s, p_r) == {'send': p_s, 'recv': p_r}
+    assert file.record_net('next', n_s, n_r) == {'send': e_s, 'recv': e_r}
+
+def test_record_net_invalid_type(file):
     with pytest.raises(ValueError, match='Unsupported network record type'):
         file.record_net('invalid', 100, 200)
 
-def test_request():
-    class MockRequest:
-        def __init__(self, method, data):
-            self.method = method
-            self.form = data if method == 'POST' else {}
-            self.args = data if method == 'GET' else {}
-    
-    # Test POST request
-    post_request = MockRequest('POST', {'test': 'value'})
-    assert Method._request(post_request, 'test') == 'value'
-    
-    # Test GET request
-    get_request = MockRequest('GET', {'test': 'value'})
-    assert Method._request(get_request, 'test') == 'value'
-    
-    # Test unsupported method
+@pytest.mark.parametrize("method,attr", [('POST', 'form'), ('GET', 'args')])
+def test_request(method, attr):
+    request = types.SimpleNamespace(method=method, form={}, args={})
+    getattr(request, attr)['test'] = 'value'
+    assert Method._request(request, 'test') == 'value'
+
+def test_request_unsupported_method():
+    request = types.SimpleNamespace(method='PUT', form={}, args={})
     with pytest.raises(ValueError, match='Unsupported HTTP method'):
-        Method._request(MockRequest('PUT', {}), 'test') 
\ No newline at end of file
+        Method._request(request, 'test')
@@ -1,109 +1,126 @@
 import pytest
 import os
 import json
+from types import MappingProxyType
 from solox.public.common import Devices, File, Method, Platform
 
-def test_ios_device_detection():
+# Canned answers of the fake iOS device, the tests compare against these
+FAKE_UDID = '00008101-000A1B2C3D4E5F60'
+FAKE_DEVICE_INFO = {'DeviceName': 'iPhone', 'ProductVersion': '17.0', 'ProductType': 'iPhone14,2'}
+FAKE_SCREEN_INFO = {'width': 1170, 'height': 2532}
+FAKE_BUNDLE_IDS = ['com.example.app', 'com.example.other']
+# Report creation time, already in the format the report shows
+CTIME = '2024-03-03-12-00-00'
+
+# Summary make_ios_html requires, copied by each test that renders a report
+IOS_SUMMARY_TEMPLATE = MappingProxyType({
+    'devices': 'iPhone 14',
+    'app': 'test_app',
+    'platform': Platform.iOS,
+    'ctime': CTIME,
+    'cpu_app': '10%',
+    'cpu_sys': '5%',
+    'gpu': 30.5,
+    'mem_total': '500MB',
+    'fps': '60',
+    'tem': 35,
+    'current': 200,
+    'voltage': 4000,
+    'power': 800,
+    'net_send': '1MB',
+    'net_recv': '2MB',
+    'cpu_charts': [],
+    'mem_charts': [],
+    'net_charts': [],
+    'battery_charts': [],
+    'fps_charts': [],
+    'gpu_charts': []
+})
+
+class FakeInstallation:
+    def iter_installed(self, app_type="User"):
+        return ({'CFBundleIdentifier': bundle_id} for bundle_id in FAKE_BUNDLE_IDS)
+
+class FakeDevice:
+    """Stands in for tidevice's Device, only FAKE_UDID is attached"""
+    def __init__(self, udid=None):
+        if udid != FAKE_UDID:
+            raise RuntimeError(f'device {udid} not connected')
+        self.udid = udid
+        self.installation = FakeInstallation()
+
+    def device_info(self):
+        return dict(FAKE_DEVICE_INFO)
+
+    def screen_info(self):
+        return dict(FAKE_SCREEN_INFO)
+
+class FakeUsbmux:
+    def device_udid_list(self):
+        return [FAKE_UDID]
+
+@pytest.fixture(scope="module")
+def mock_ios():
+    """Answer tidevice's usbmux and device queries in-process instead of over USB"""
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr('solox.public.common.Device', FakeDevice)
+        mp.setattr('solox.public.common.Usbmux', FakeUsbmux)
+        yield
+
+@pytest.fixture(scope="module")
+def ios_device_id(mock_ios):
+    """udid of the first attached iOS device, enumerated once for the module"""
+    return Devices(platform=Platform.iOS).getDeviceInfoByiOS()[0]
+
+def test_ios_device_detection(mock_ios):
     devices = Devices(platform=Platform.iOS)
     device_list = devices.getDeviceInfoByiOS()
-    assert len(device_list) > 0, "No iOS devices found"
+    assert device_list == [FAKE_UDID]
     
     # Test device details
     device_id = device_list[0]
     device_details = devices.getDdeviceDetail(device_id, Platform.iOS)
-    assert device_details is not None
-    assert isinstance(device_details, dict)
-    assert 'name' in device_details
-    assert 'version' in device_details
-    assert 'model' in device_details
-    assert 'brand' in device_details
-    assert 'manufacturer' in device_details
+    assert device_details == {
+        'name': FAKE_DEVICE_INFO['DeviceName'],
+        'version': FAKE_DEVICE_INFO['ProductVersion'],
+        'model': FAKE_DEVICE_INFO['ProductType'],
+        'brand': 'Apple',
+        'manufacturer': 'Apple'
+    }
     
     # Test device check
     devices.devicesCheck(Platform.iOS, device_id)
+    devices.devicesCheck(Platform.iOS, device_id, FAKE_BUNDLE_IDS[0])
     
     # Test package names
-    pkg_names = devices.getPkgnameByiOS(device_id)
-    assert isinstance(pkg_names, list)
+    assert devices.getPkgnameByiOS(device_id) == FAKE_BUNDLE_IDS
     
     # Test physical size
-    screen_size = devices.getPhysicalSizeOfiOS(device_id)
-    assert isinstance(screen_size, str)
-    if screen_size:
-        width, height = map(int, screen_size.split('x'))
-        assert width > 0
-        assert height > 0
-
-def test_network_monitoring():
-    file = File()
-    
-    # Test pre-network recording
-    pre_result = file.record_net('pre', 1000, 2000)
-    assert pre_result['send'] == 1000
-    assert pre_result['recv'] == 2000
-    
-    # Test next-network recording
-    next_result = file.record_net('next', 3000, 4000)
-    assert next_result['send'] == 2000  # 3000 - 1000
-    assert next_result['recv'] == 2000  # 4000 - 2000
+    assert devices.getPhysicalSizeOfiOS(device_id) == '{width}x{height}'.format(**FAKE_SCREEN_INFO)
 
-def test_report_generation():
+def test_report_generation(tmp_path, monkeypatch):
     file = File()
+    monkeypatch.setattr(file, 'report_dir', str(tmp_path))
     scene = 'test_scene'
     
-    # Create test data
-    os.makedirs(os.path.join(file.report_dir, scene), exist_ok=True)
-    
     # Test iOS report generation
-    ios_summary = {
-        'devices': 'iPhone 14',
-        'app': 'test_app',
-        'platform': Platform.iOS,
-        'ctime': '2024-03-03-12-00-00',
-        'cpu_app': '10%',
-        'cpu_sys': '5%',
-        'gpu': 30.5,
-        'mem_total': '500MB',
-        'fps': '60',
-        'tem': 35,
-        'current': 200,
-        'voltage': 4000,
-        'power': 800,
-        'net_send': '1MB',
-        'net_recv': '2MB',
-        'cpu_charts': [],
-        'mem_charts': [],
-        'net_charts': [],
-        'battery_charts': [],
-        'fps_charts': [],
-        'gpu_charts': []
-    }
+    ios_summary = dict(IOS_SUMMARY_TEMPLATE)
     
-    try:
-        report_path = file.make_ios_html(scene, ios_summary)
-        assert os.path.exists(report_path)
-    except Exception as e:
-        pytest.fail(f"Failed to generate iOS report: {str(e)}")
-    finally:
-        # Cleanup
-        if os.path.exists(os.path.join(file.report_dir, scene)):
-            import shutil
-            shutil.rmtree(os.path.join(file.report_dir, scene))
+    report_path = file.make_ios_html(scene, ios_summary)
+    assert report_path == str(tmp_path / scene / 'report.html')
+    with open(report_path, encoding='utf-8') as f:
+        assert f'value="{CTIME}"' in f.read()
 
-def test_ios_error_handling():
+def test_ios_error_handling(mock_ios, ios_device_id):
     devices = Devices(platform=Platform.iOS)
     
     # Test invalid device ID
-    with pytest.raises(Exception):
+    with pytest.raises(Exception, match='Device not found'):
         devices.getDdeviceDetail('invalid_id', Platform.iOS)
     
-    # Test unsupported platform
-    with pytest.raises(ValueError, match='Unsupported platform'):
-        devices.getDdeviceDetail('any_id', 'Windows')
-    
     # Test invalid package name
-    with pytest.raises(Exception):
-        devices.devicesCheck(Platform.iOS, devices.getDeviceInfoByiOS()[0], 'invalid.package')
+    with pytest.raises(Exception, match='package not found'):
+        devices.devicesCheck(Platform.iOS, ios_device_id, 'invalid.package')
         
     # Test physical size with invalid device
     assert devices.getPhysicalSizeOfiOS('invalid_id') == ''